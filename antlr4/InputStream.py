@@ -19,10 +19,12 @@ class InputStream (object):
         self.strdata = data
         self._loadString()
 
+    # The characters are read from the string itself, which already stores
+    # them with 1, 2 or 4 bytes each, instead of from a list of code points
+    # costing several times the size of the text.
     def _loadString(self):
         self._index = 0
-        self.data = [ord(c) for c in self.strdata]
-        self._size = len(self.data)
+        self._size = len(self.strdata)
 
     @property
     def index(self):
@@ -53,7 +55,7 @@ class InputStream (object):
         pos = self._index + offset - 1
         if pos < 0 or pos >= self._size: # invalid
             return Token.EOF
-        return self.data[pos]
+        return ord(self.strdata[pos])
 
     def LT(self, offset: int):
         return self.LA(offset)
@@ -11,15 +11,55 @@ from .Token import Token
 # need forward declarations
 IntervalSet = None
 
+# A set whose members all lie in [BITS_MIN, BITS_LIMIT) is stored as the bits
+# of an int: bit v - BITS_MIN stands for v. This covers the token types of
+# small grammars, EOF, EPSILON and Latin-1 characters. A set switches to a
+# sorted list of ranges once it gets a member out of this span.
+BITS_MIN = Token.EPSILON
+BITS_LIMIT = 256
+
 class IntervalSet(object):
 
     def __init__(self):
-        self.intervals = None
+        # Both are None until a member is added, at most one is not None
+        self._bits = None
+        self._ranges = None
         self.readOnly = False
 
+    # The members as a sorted list of ranges, None if none was ever added
+    @property
+    def intervals(self):
+        if self._bits is not None:
+            return list(self._bitRanges())
+        return self._ranges
+
+    def _bitRanges(self):
+        bits = self._bits
+        v = BITS_MIN
+        while bits:
+            # skip the zeros, then take the run of ones
+            skip = (bits & -bits).bit_length() - 1
+            bits >>= skip
+            v += skip
+            run = (bits ^ (bits + 1)).bit_length() - 1
+            yield range(v, v + run)
+            bits >>= run
+            v += run
+
+    def _toRanges(self):
+        if self._bits is not None:
+            self._ranges = list(self._bitRanges())
+            self._bits = None
+
     def __iter__(self):
-        if self.intervals is not None:
-            for i in self.intervals:
+        if self._bits is not None:
+            bits = self._bits
+            while bits:
+                low = bits & -bits
+                yield low.bit_length() - 1 + BITS_MIN
+                bits ^= low
+        elif self._ranges is not None:
+            for i in self._ranges:
                 for c in i:
                     yield c
 
@@ -36,133 +76,148 @@ class IntervalSet(object):
         self.addRange(range(v, v+1))
 
     def addRange(self, v:range):
-        if self.intervals is None:
-            self.intervals = list()
-            self.intervals.append(v)
+        if self._ranges is None:
+            if v.start >= BITS_MIN and v.stop <= BITS_LIMIT:
+                self._bits = (self._bits or 0) | (((1 << len(v)) - 1) << (v.start - BITS_MIN))
+                return
+            self._toRanges()
+        if self._ranges is None:
+            self._ranges = list()
+            self._ranges.append(v)
         else:
             # find insert pos
             k = 0
-            for i in self.intervals:
+            for i in self._ranges:
                 # distinct range -> insert
                 if v.stop<i.start:
-                    self.intervals.insert(k, v)
+                    self._ranges.insert(k, v)
                     return
                 # contiguous range -> adjust
                 elif v.stop==i.start:
-                    self.intervals[k] = range(v.start, i.stop)
+                    self._ranges[k] = range(v.start, i.stop)
                     return
                 # overlapping range -> adjust and reduce
                 elif v.start<=i.stop:
-                    self.intervals[k] = range(min(i.start,v.start), max(i.stop,v.stop))
+                    self._ranges[k] = range(min(i.start,v.start), max(i.stop,v.stop))
                     self.reduce(k)
                     return
                 k += 1
             # greater than any existing
-            self.intervals.append(v)
+            self._ranges.append(v)
 
     def addSet(self, other:IntervalSet):
-        if other.intervals is not None:
-            for i in other.intervals:
+        if other._bits:
+            if self._ranges is None:
+                self._bits = (self._bits or 0) | other._bits
+            else:
+                for i in other._bitRanges():
+                    self.addRange(i)
+        elif other._ranges is not None:
+            for i in other._ranges:
                 self.addRange(i)
         return self
 
     def reduce(self, k:int):
         # only need to reduce if k is not the last
-        if k<len(self.intervals)-1:
-            l = self.intervals[k]
-            r = self.intervals[k+1]
+        if k<len(self._ranges)-1:
+            l = self._ranges[k]
+            r = self._ranges[k+1]
             # if r contained in l
             if l.stop >= r.stop:
-                self.intervals.pop(k+1)
+                self._ranges.pop(k+1)
                 self.reduce(k)
             elif l.stop >= r.start:
-                self.intervals[k] = range(l.start, r.stop)
-                self.intervals.pop(k+1)
+                self._ranges[k] = range(l.start, r.stop)
+                self._ranges.pop(k+1)
 
     def complement(self, start, stop):
         result = IntervalSet()
         result.addRange(range(start,stop+1))
-        for i in self.intervals:
-            result.removeRange(i)
+        if result._bits is not None and self._ranges is None:
+            result._bits &= ~(self._bits or 0)
+        else:
+            for i in self.intervals or ():
+                result.removeRange(i)
         return result
 
     def __contains__(self, item):
-        if self.intervals is None:
+        bits = self._bits
+        if bits is not None:
+            return item >= BITS_MIN and (bits >> (item - BITS_MIN)) & 1 == 1
+        elif self._ranges is None:
             return False
         else:
-            return any(item in i for i in self.intervals)
+            return any(item in i for i in self._ranges)
 
     def __len__(self):
-        return sum(len(i) for i in self.intervals)
+        if self._bits is not None:
+            return bin(self._bits).count("1")
+        elif self._ranges is None:
+            return 0
+        else:
+            return sum(len(i) for i in self._ranges)
 
     def removeRange(self, v):
-        if v.start==v.stop-1:
-            self.removeOne(v.start)
-        elif self.intervals is not None:
-            k = 0
-            for i in self.intervals:
-                # intervals are ordered
-                if v.stop<=i.start:
-                    return
-                # check for including range, split it
-                elif v.start>i.start and v.stop<i.stop:
-                    self.intervals[k] = range(i.start, v.start)
-                    x = range(v.stop, i.stop)
-                    self.intervals.insert(k, x)
-                    return
-                # check for included range, remove it
-                elif v.start<=i.start and v.stop>=i.stop:
-                    self.intervals.pop(k)
-                    k -= 1  # need another pass
-                # check for lower boundary
-                elif v.start<i.stop:
-                    self.intervals[k] = range(i.start, v.start)
-                # check for upper boundary
-                elif v.stop<i.stop:
-                    self.intervals[k] = range(v.stop, i.stop)
-                k += 1
+        if self._bits is not None:
+            start, stop = max(v.start, BITS_MIN), min(v.stop, BITS_LIMIT)
+            if start < stop:
+                self._bits &= ~(((1 << (stop - start)) - 1) << (start - BITS_MIN))
+        elif self._ranges is not None:
+            # keep the parts of the ranges out of v
+            ranges = []
+            for i in self._ranges:
+                if i.stop<=v.start or v.stop<=i.start:
+                    ranges.append(i)
+                    continue
+                if i.start<v.start:
+                    ranges.append(range(i.start, v.start))
+                if v.stop<i.stop:
+                    ranges.append(range(v.stop, i.stop))
+            self._ranges = ranges
 
     def removeOne(self, v):
-        if self.intervals is not None:
+        if self._bits is not None:
+            if BITS_MIN <= v < BITS_LIMIT:
+                self._bits &= ~(1 << (v - BITS_MIN))
+        elif self._ranges is not None:
             k = 0
-            for i in self.intervals:
+            for i in self._ranges:
                 # intervals is ordered
                 if v<i.start:
                     return
                 # check for single value range
                 elif v==i.start and v==i.stop-1:
-                    self.intervals.pop(k)
+                    self._ranges.pop(k)
                     return
                 # check for lower boundary
                 elif v==i.start:
-                    self.intervals[k] = range(i.start+1, i.stop)
+                    self._ranges[k] = range(i.start+1, i.stop)
                     return
                 # check for upper boundary
                 elif v==i.stop-1:
-                    self.intervals[k] = range(i.start, i.stop-1)
+                    self._ranges[k] = range(i.start, i.stop-1)
                     return
                 # split existing range
                 elif v<i.stop-1:
                     x = range(i.start, v)
-                    self.intervals[k] = range(v + 1, i.stop)
-                    self.intervals.insert(k, x)
+                    self._ranges[k] = range(v + 1, i.stop)
+                    self._ranges.insert(k, x)
                     return
                 k += 1
 
 
     def toString(self, literalNames:list, symbolicNames:list):
-        if self.intervals is None:
+        if self._bits is None and self._ranges is None:
             return "{}"
         with StringIO() as buf:
             if len(self)>1:
                 buf.write("{")
             first = True
-            for i in self.intervals:
-                for j in i:
-                    if not first:
-                        buf.write(", ")
-                    buf.write(self.elementName(literalNames, symbolicNames, j))
-                    first = False
+            for j in self:
+                if not first:
+                    buf.write(", ")
+                buf.write(self.elementName(literalNames, symbolicNames, j))
+                first = False
             if len(self)>1:
                 buf.write("}")
             return buf.getvalue()
@@ -35,6 +35,10 @@ ParserRuleContext = None
 
 class ParserRuleContext(RuleContext):
 
+    # The generated contexts of each rule set `parser`. As it is a slot, they
+    # don't get an instance dict unless they assign other attributes.
+    __slots__ = ("children", "start", "stop", "exception", "parser")
+
     def __init__(self, parent:ParserRuleContext = None, invokingStateNumber:int = None ):
         super().__init__(parent, invokingStateNumber)
         #* If we are debugging or building a parse tree for a visitor,
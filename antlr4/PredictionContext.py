@@ -49,6 +49,8 @@ class PredictionContext(object):
     # </pre>
     #/
 
+    __slots__ = ("cachedHashCode",)
+
     def __init__(self, cachedHashCode:int):
         self.cachedHashCode = cachedHashCode
 
@@ -108,6 +110,8 @@ class PredictionContextCache(object):
 
 class SingletonPredictionContext(PredictionContext):
 
+    __slots__ = ("parentCtx", "returnState")
+
     @staticmethod
     def create(parent:PredictionContext , returnState:int ):
         if returnState == PredictionContext.EMPTY_RETURN_STATE and parent is None:
@@ -157,6 +161,8 @@ class SingletonPredictionContext(PredictionContext):
 
 class EmptyPredictionContext(SingletonPredictionContext):
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(None, self.EMPTY_RETURN_STATE)
 
@@ -180,6 +186,8 @@ class ArrayPredictionContext(PredictionContext):
     #  from {@link #EMPTY} and non-empty. We merge {@link #EMPTY} by using null parent and
     #  returnState == {@link #EMPTY_RETURN_STATE}.
 
+    __slots__ = ("parents", "returnStates")
+
     def __init__(self, parents:list, returnStates:list):
         super().__init__(calculateListsHashCode(parents, returnStates))
         self.parents = parents
@@ -36,6 +36,8 @@ class RuleContext(RuleNode):
 
     EMPTY = None
 
+    __slots__ = ("parentCtx", "invokingState")
+
     def __init__(self, parent:RuleContext=None, invokingState:int=-1):
         super().__init__()
         # What context invoked this rule?
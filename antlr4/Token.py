@@ -32,6 +32,9 @@ class Token (object):
 
     HIDDEN_CHANNEL = 1
 
+    # Tokens are created by the hundreds of thousands, no per-instance dict
+    __slots__ = ("source", "type", "channel", "start", "stop", "tokenIndex", "line", "column", "_text")
+
     def __init__(self):
         self.source = None
         self.type = None # token type of the token
@@ -73,6 +76,8 @@ class CommonToken(Token):
     # {@link #source} for tokens that do not have a source.
     EMPTY_SOURCE = (None, None)
 
+    __slots__ = ()
+
     def __init__(self, source:tuple = EMPTY_SOURCE, type:int = None, channel:int=Token.DEFAULT_CHANNEL, start:int=-1, stop:int=-1):
         super().__init__()
         self.source = source
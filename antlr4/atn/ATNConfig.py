@@ -22,6 +22,8 @@ ATNConfig = None
 
 class ATNConfig(object):
 
+    __slots__ = ("state", "alt", "context", "semanticContext", "reachesIntoOuterContext", "precedenceFilterSuppressed")
+
     def __init__(self, state:ATNState=None, alt:int=None, context:PredictionContext=None, semantic:SemanticContext=None, config:ATNConfig=None):
         if config is not None:
             if state is None:
@@ -74,18 +76,10 @@ class ATNConfig(object):
     def __hash__(self):
         return hash((self.state.stateNumber, self.alt, self.context, self.semanticContext))
 
-    def hashCodeForConfigSet(self):
-        return hash((self.state.stateNumber, self.alt, hash(self.semanticContext)))
-
-    def equalsForConfigSet(self, other):
-        if self is other:
-            return True
-        elif not isinstance(other, ATNConfig):
-            return False
-        else:
-            return self.state.stateNumber==other.state.stateNumber \
-                and self.alt==other.alt \
-                and self.semanticContext==other.semanticContext
+    # The key of the config in an ATNConfigSet. Configs with equal keys are
+    #  merged by the set.
+    def keyForConfigSet(self):
+        return (self.state.stateNumber, self.alt, self.semanticContext)
 
     def __str__(self):
         with StringIO() as buf:
@@ -111,6 +105,8 @@ LexerATNConfig = None
 
 class LexerATNConfig(ATNConfig):
 
+    __slots__ = ("lexerActionExecutor", "passedThroughNonGreedyDecision")
+
     def __init__(self, state:ATNState, alt:int=None, context:PredictionContext=None, semantic:SemanticContext=SemanticContext.NONE,
                  lexerActionExecutor:LexerActionExecutor=None, config:LexerATNConfig=None):
         super().__init__(state=state, alt=alt, context=context, semantic=semantic, config=config)
@@ -139,13 +135,8 @@ class LexerATNConfig(ATNConfig):
 
 
 
-    def hashCodeForConfigSet(self):
-        return hash(self)
-
-
-
-    def equalsForConfigSet(self, other):
-        return self==other
+    def keyForConfigSet(self):
+        return self
 
 
 
@@ -9,7 +9,6 @@
 # graph-structured stack.
 #/
 from io import StringIO
-from functools import reduce
 from ..PredictionContext import PredictionContext, merge
 from ..Utils import str_list
 from ..atn.ATN import ATN
@@ -28,7 +27,7 @@ class ATNConfigSet(object):
     # use a hash table that lets us specify the equals/hashcode operation.
 
     def __init__(self, fullCtx:bool=True):
-        # All configs but hashed by (s, i, _, pi) not including context. Wiped out
+        # All configs but keyed by (s, i, pi) not including context. Wiped out
         # when we go readonly as this set becomes a DFA state.
         self.configLookup = dict()
         # Indicates that this configuration set is part of a full context
@@ -45,10 +44,19 @@ class ATNConfigSet(object):
         self.configs = []
 
         # TODO: these fields make me pretty uncomfortable but nice to pack up info together, saves recomputation
-        # TODO: can we track conflicts as they are added to save scanning configs later?
         self.uniqueAlt = 0
         self.conflictingAlts = None
 
+        # The alts of the configs, and the alts of the configs of each state
+        # number, tracked as configs are added so predicting doesn't scan them
+        self.alts = set()
+        self.stateAlts = dict()
+        # The alt subsets of PredictionMode.getConflictingAltSubsets(), keyed by
+        # (state number, context). A config with a semantic context can share
+        # its key and alt with another, so the subsets aren't tracked then and
+        # are None. Wiped out with configLookup.
+        self.altSubsets = dict()
+
         # Used in parser and lexer. In lexer, it indicates we hit a pred
         # while computing a closure operation.  Don't make a DFA state from this.
         self.hasSemanticContext = False
@@ -73,12 +81,25 @@ class ATNConfigSet(object):
             raise Exception("This set is readonly")
         if config.semanticContext is not SemanticContext.NONE:
             self.hasSemanticContext = True
+            self.altSubsets = None
         if config.reachesIntoOuterContext > 0:
             self.dipsIntoOuterContext = True
-        existing = self.getOrAdd(config)
-        if existing is config:
+        key = config.keyForConfigSet()
+        existing = self.configLookup.get(key)
+        if existing is None:
+            self.configLookup[key] = config
             self.cachedHashCode = -1
             self.configs.append(config)  # track order here
+            alt = config.alt
+            self.alts.add(alt)
+            stateNumber = config.state.stateNumber
+            alts = self.stateAlts.get(stateNumber)
+            if alts is None:
+                self.stateAlts[stateNumber] = {alt}
+            else:
+                alts.add(alt)
+            if self.altSubsets is not None:
+                self.addToAltSubset(stateNumber, config.context, alt)
             return True
         # a previous (s,i,pi,_), merge with it and save result
         rootIsWildcard = not self.fullCtx
@@ -90,22 +111,26 @@ class ATNConfigSet(object):
         # make sure to preserve the precedence filter suppression during the merge
         if config.precedenceFilterSuppressed:
             existing.precedenceFilterSuppressed = True
-        existing.context = merged # replace context; no need to alt mapping
+        if merged is not existing.context:
+            if self.altSubsets is not None:
+                # the alt moves to the subset of the merged context
+                stateNumber = existing.state.stateNumber
+                key = (stateNumber, existing.context)
+                alts = self.altSubsets[key]
+                alts.discard(existing.alt)
+                if not alts:
+                    del self.altSubsets[key]
+                self.addToAltSubset(stateNumber, merged, existing.alt)
+            existing.context = merged # replace context; no need to alt mapping
         return True
 
-    def getOrAdd(self, config:ATNConfig):
-        h = config.hashCodeForConfigSet()
-        l = self.configLookup.get(h, None)
-        if l is not None:
-            r = next((cfg for cfg in l if config.equalsForConfigSet(cfg)), None)
-            if r is not None:
-                return r
-        if l is None:
-            l = [config]
-            self.configLookup[h] = l
+    def addToAltSubset(self, stateNumber:int, context:PredictionContext, alt:int):
+        key = (stateNumber, context)
+        alts = self.altSubsets.get(key)
+        if alts is None:
+            self.altSubsets[key] = {alt}
         else:
-            l.append(config)
-        return config
+            alts.add(alt)
 
     def getStates(self):
         return set(c.state for c in self.configs)
@@ -153,7 +178,7 @@ class ATNConfigSet(object):
         return self.hashConfigs()
 
     def hashConfigs(self):
-        return reduce(lambda h, cfg: hash((h, cfg)), self.configs, 0)
+        return hash(tuple(self.configs))
 
     def __len__(self):
         return len(self.configs)
@@ -164,13 +189,7 @@ class ATNConfigSet(object):
     def __contains__(self, config):
         if self.configLookup is None:
             raise UnsupportedOperationException("This method is not implemented for readonly sets.")
-        h = config.hashCodeForConfigSet()
-        l = self.configLookup.get(h, None)
-        if l is not None:
-            for c in l:
-                if config.equalsForConfigSet(c):
-                    return True
-        return False
+        return config.keyForConfigSet() in self.configLookup
 
     def clear(self):
         if self.readonly:
@@ -178,10 +197,15 @@ class ATNConfigSet(object):
         self.configs.clear()
         self.cachedHashCode = -1
         self.configLookup.clear()
+        self.alts.clear()
+        self.stateAlts.clear()
+        self.altSubsets = None if self.hasSemanticContext else dict()
 
     def setReadonly(self, readonly:bool):
         self.readonly = readonly
         self.configLookup = None # can't mod, no need for lookup cache
+        self.stateAlts = None
+        self.altSubsets = None
 
     def __str__(self):
         with StringIO() as buf:
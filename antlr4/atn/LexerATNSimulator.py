@@ -200,10 +200,14 @@ class LexerATNSimulator(ATNSimulator):
     # {@code t}, or {@code null} if the target state for this edge is not
     # already cached
     def getExistingTargetState(self, s:DFAState, t:int):
-        if s.edges is None or t < self.MIN_DFA_EDGE or t > self.MAX_DFA_EDGE:
+        if t > self.MAX_DFA_EDGE:
+            if s.sparseEdges is None:
+                return None
+            target = s.sparseEdges.get(t)
+        elif s.edges is None or t < self.MIN_DFA_EDGE:
             return None
-
-        target = s.edges[t - self.MIN_DFA_EDGE]
+        else:
+            target = s.edges[t - self.MIN_DFA_EDGE]
         if LexerATNSimulator.debug and target is not None:
             print("reuse state", str(s.stateNumber), "edge to", str(target.stateNumber))
 
@@ -496,8 +500,17 @@ class LexerATNSimulator(ATNSimulator):
                 return to
 
         # add the edge
-        if tk < self.MIN_DFA_EDGE or tk > self.MAX_DFA_EDGE:
-            # Only track edges within the DFA bounds
+        if tk < self.MIN_DFA_EDGE:
+            # EOF isn't tracked
+            return to
+
+        if tk > self.MAX_DFA_EDGE:
+            # Symbols above the dense table go to a dict, so that non-ASCII
+            # input (e.g. CJK identifiers) doesn't go through the ATN on every
+            # character while the table stays small.
+            if from_.sparseEdges is None:
+                from_.sparseEdges = dict()
+            from_.sparseEdges[tk] = to # connect
             return to
 
         if LexerATNSimulator.debug:
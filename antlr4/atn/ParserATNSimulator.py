@@ -1523,13 +1523,9 @@ class ParserATNSimulator(ATNSimulator):
         return NoViableAltException(self.parser, input, input.get(startIndex), input.LT(1), configs, outerContext)
 
     def getUniqueAlt(self, configs:ATNConfigSet):
-        alt = ATN.INVALID_ALT_NUMBER
-        for c in configs:
-            if alt == ATN.INVALID_ALT_NUMBER:
-                alt = c.alt # found first alt
-            elif c.alt!=alt:
-                return ATN.INVALID_ALT_NUMBER
-        return alt
+        if len(configs.alts)==1:
+            return next(iter(configs.alts))
+        return ATN.INVALID_ALT_NUMBER
 
     #
     # Add an edge to the DFA, if possible. This method calls
@@ -455,6 +455,8 @@ class PredictionMode(Enum):
     #
     @classmethod
     def getConflictingAltSubsets(cls, configs:ATNConfigSet):
+        if configs.altSubsets is not None:
+            return configs.altSubsets.values()
         configToAlts = dict()
         for c in configs:
             h = hash((c.state.stateNumber, c.context))
@@ -486,7 +488,10 @@ class PredictionMode(Enum):
 
     @classmethod
     def hasStateAssociatedWithOneAlt(cls, configs:ATNConfigSet):
-        return any(len(alts) == 1 for alts in cls.getStateToAltMap(configs).values())
+        stateAlts = configs.stateAlts
+        if stateAlts is None:
+            stateAlts = cls.getStateToAltMap(configs)
+        return any(len(alts) == 1 for alts in stateAlts.values())
 
     @classmethod
     def getSingleViableAlt(cls, altsets:list):
@@ -44,12 +44,18 @@ class PredPrediction(object):
 #/
 class DFAState(object):
 
+    __slots__ = ("stateNumber", "configs", "edges", "sparseEdges", "isAcceptState", "prediction",
+                 "lexerActionExecutor", "requiresFullContext", "predicates")
+
     def __init__(self, stateNumber:int=-1, configs:ATNConfigSet=ATNConfigSet()):
         self.stateNumber = stateNumber
         self.configs = configs
         # {@code edges[symbol]} points to target of symbol. Shift up by 1 so (-1)
         #  {@link Token#EOF} maps to {@code edges[0]}.
         self.edges = None
+        # Lexer edges for symbols above LexerATNSimulator.MAX_DFA_EDGE, keyed
+        # by symbol.
+        self.sparseEdges = None
         self.isAcceptState = False
         # if accept state, what ttype do we match or alt do we predict?
         #  This is set to {@link ATN#INVALID_ALT_NUMBER} when {@link #predicates}{@code !=null} or
@@ -80,7 +86,7 @@ class DFAState(object):
     #  DFA state.
     def getAltSet(self):
         if self.configs is not None:
-            return set(cfg.alt for cfg in self.configs) or None
+            return set(self.configs.alts) or None
         return None
 
     def __hash__(self):
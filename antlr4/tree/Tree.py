@@ -12,16 +12,16 @@ from ..Token import Token
 INVALID_INTERVAL = (-1, -2)
 
 class Tree(object):
-    pass
+    __slots__ = ()
 
 class SyntaxTree(Tree):
-    pass
+    __slots__ = ()
 
 class ParseTree(SyntaxTree):
-    pass
+    __slots__ = ()
 
 class RuleNode(ParseTree):
-    pass
+    __slots__ = ()
 
 class TerminalNode(ParseTree):
     pass
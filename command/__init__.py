@@ -2,11 +2,17 @@ from .print_to_panel import PrintToPanelCommand
 from .set_layout_engine import SetLayoutEngineCommand
 from .set_output_format import SetOutputFormatCommand
 from .open_image import OpenImageCommand
+from .show_cache_stats import ShowCacheStatsCommand
+from .show_render_stats import ShowRenderStatsCommand
+from .show_checker_memory import ShowCheckerMemoryCommand
 
 
 __all__ = [
 	"PrintToPanelCommand",
 	"SetLayoutEngineCommand",
 	"SetOutputFormatCommand",
-	"OpenImageCommand"
+	"OpenImageCommand",
+	"ShowCacheStatsCommand",
+	"ShowRenderStatsCommand",
+	"ShowCheckerMemoryCommand"
 ]
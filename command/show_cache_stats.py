@@ -0,0 +1,13 @@
+import sublime
+import sublime_plugin
+import sys
+
+
+# Print the hit rate of the render cache to graphvizer_panel
+class ShowCacheStatsCommand(sublime_plugin.WindowCommand):
+
+	def run(self):
+		_mod = sys.modules["Graphvizer.graphvizer"]
+		core_listener = _mod.__plugins__[0]
+		self.window.run_command("print_to_panel", {"text": core_listener.render_cache.stats()})
+		self.window.run_command("show_panel", {"panel": "output.graphvizer_panel"})
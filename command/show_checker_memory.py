@@ -0,0 +1,17 @@
+import sublime
+import sublime_plugin
+import sys
+
+
+# Print the memory taken by the syntax checker to graphvizer_panel
+class ShowCheckerMemoryCommand(sublime_plugin.WindowCommand):
+
+	def run(self):
+		# Measuring waits for the running check, which can take seconds
+		sublime.set_timeout_async(self.show_report)
+
+	def show_report(self):
+		_mod = sys.modules["Graphvizer.graphvizer"]
+		core_listener = _mod.__plugins__[0]
+		self.window.run_command("print_to_panel", {"text": core_listener.checker_memory_report()})
+		self.window.run_command("show_panel", {"panel": "output.graphvizer_panel"})
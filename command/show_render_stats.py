@@ -0,0 +1,13 @@
+import sublime
+import sublime_plugin
+import sys
+
+
+# Print the latency percentiles of each rendering stage to graphvizer_panel
+class ShowRenderStatsCommand(sublime_plugin.WindowCommand):
+
+	def run(self):
+		_mod = sys.modules["Graphvizer.graphvizer"]
+		core_listener = _mod.__plugins__[0]
+		self.window.run_command("print_to_panel", {"text": core_listener.render_stats.report()})
+		self.window.run_command("show_panel", {"panel": "output.graphvizer_panel"})
@@ -2,10 +2,9 @@ import sublime
 import sublime_plugin
 import os
 import sys
-from . import syntaxchecker
+import importlib
 import threading, queue
 import subprocess
-import tempfile
 # Although this file don't use modules in command/ directory, we still need to import it.
 # Otherwise these commands won't be recognized by Sublime and key bindings will not work.
 from .command import *
@@ -13,6 +12,24 @@ from .command import *
 from .lib import *
 
 
+# Seconds between two saves of the syntax checker DFAs
+DFA_SAVE_INTERVAL = 300
+# Seconds plugin_unloaded() waits for a running check before giving up the
+# save, which the periodic saves have mostly done already
+DFA_SAVE_UNLOAD_TIMEOUT = 0.2
+
+# The syntax checker imports the whole ANTLR runtime, which takes longer than
+# loading the rest of the plugin. It is imported by the warm-up thread started
+# in plugin_loaded(), or by the first check if that comes earlier, so Sublime
+# Text doesn't wait for it at startup. None until it has been imported.
+syntaxchecker = None
+def get_syntaxchecker():
+	global syntaxchecker
+	if syntaxchecker is None:
+		# Thread-safe: a concurrent import waits for the first one to finish
+		syntaxchecker = importlib.import_module(".lexerparser.syntaxchecker", __package__)
+	return syntaxchecker
+
 print(f"Graphvizer runtime env: ST {sublime.version()}, Py {sys.version}")
 st_settings = None
 def plugin_loaded():
@@ -24,6 +41,8 @@ def plugin_loaded():
 	# we will render the image for each DOT view and set a suitable saving status for it.
 	_mod = sys.modules[__name__]
 	core_listener = _mod.__plugins__[0]
+	core_listener.start_workers()
+	threading.Thread(target=core_listener.warm_up_checker, daemon=True).start()
 	for view in sublime.active_window().views():
 		if view.settings().get('syntax') != "Packages/Graphviz/DOT.sublime-syntax":
 			continue
@@ -31,12 +50,26 @@ def plugin_loaded():
 		if view.file_name() is not None: # File exists on disk
 			view.settings().set("persistence", True) # Set a suitable saving status for this DOT view
 
+def plugin_unloaded():
+	core_listener = sys.modules[__name__].__plugins__[0]
+	core_listener.unloaded = True
+	core_listener.save_checker_dfa(DFA_SAVE_UNLOAD_TIMEOUT)
+
 def add_st_settings_callback():
 	st_settings.add_on_change("dot_cmd_path", st_settings_changes)
 	st_settings.add_on_change("dot_timeout", st_settings_changes)
 	st_settings.add_on_change("show_image_with", st_settings_changes)
 	st_settings.add_on_change("image_dir", st_settings_changes)
 	st_settings.add_on_change("render_in_realtime", st_settings_changes)
+	st_settings.add_on_change("render_delay_min", st_settings_changes)
+	st_settings.add_on_change("render_delay_max", st_settings_changes)
+	st_settings.add_on_change("render_delay_factor", st_settings_changes)
+	st_settings.add_on_change("render_cache_size", st_settings_changes)
+	st_settings.add_on_change("render_workers", st_settings_changes)
+	st_settings.add_on_change("render_trace_file", st_settings_changes)
+	st_settings.add_on_change("speculative_rendering", st_settings_changes)
+	st_settings.add_on_change("persist_checker_dfa", st_settings_changes)
+	st_settings.add_on_change("checker_memory_limit", st_settings_changes)
 
 def st_settings_changes():
 	print("Graphvizer Settings Changed")
@@ -47,18 +80,37 @@ class CoreListener(sublime_plugin.EventListener):
 
 	def __init__(self):
 		super(CoreListener, self).__init__()
-		self.queued_view = []
-		self.lock = threading.Lock()
-		self.semaphore = threading.Semaphore(value=0) # list is empty
-		# Start worker thread for graph rendering
-		dot_thread = threading.Thread(target=self.dot_thread, daemon=True)
-		dot_thread.start()
-		self.intermediate_file = self.get_intermediate_dot_filepath()
-
-	# Temporary file used to generate image
-	def get_intermediate_dot_filepath(self):
-		tempdir = tempfile.gettempdir()
-		return os.path.join(tempdir, "intermediate.dot")
+		self.render_queue = RenderQueue()
+		self.running_process = {} # view id -> dot process rendering an older revision
+		self.lock = threading.Lock() # protects running_process
+		# The ANTLR runtime isn't thread-safe. Its DFA cache is shared by all parsers.
+		self.check_lock = threading.Lock()
+		self.debouncer = RenderDebouncer()
+		self.render_cache = None # created by start_workers()
+		self.render_stats = RenderStats()
+		self.workers = []
+		self.saved_dfa_size = 0 # number of DFA states when the checker DFA was saved
+		self.unloaded = False
+		self.measured_state_count = None # objects of the checker state when it was last measured
+		self.learned_state_size = 0 # bytes taken by the checker state when it was last measured
+		self.checker_resets = 0
+
+	# Start worker threads for graph rendering. Different views are rendered
+	# concurrently, but a view is never rendered by two workers at the same time.
+	def start_workers(self):
+		if self.workers: # plugin_loaded() has been called before
+			return
+		# The cache directory belongs to the user, unlike the system temporary
+		# directory where anyone could plant images. sublime.cache_path() can't be
+		# called before the plugin is loaded.
+		self.render_cache = RenderCache(os.path.join(sublime.cache_path(), "Graphvizer", "render_cache"))
+		worker_count = st_settings.get("render_workers")
+		if worker_count <= 0: # choose according to the number of CPUs
+			worker_count = max(1, min(8, (os.cpu_count() or 1) // 2))
+		for i in range(worker_count):
+			worker = threading.Thread(target=self.dot_thread, daemon=True)
+			worker.start()
+			self.workers.append(worker)
 
 	def get_cwd(self, view):
 		dot_filepath = view.file_name()
@@ -74,65 +126,296 @@ class CoreListener(sublime_plugin.EventListener):
 		return layout_engine
 
 	def dot_thread(self):
-		while self.semaphore.acquire():
-			self.lock.acquire()
-			view = self.queued_view.pop(0)
-			self.lock.release()
-
-			# Get the contents of the whole file
-			region = sublime.Region(0, view.size())
-			contents = view.substr(region)
-			# Check if the syntax is valid
-			syntax_is_valid, log = syntaxchecker.check(contents)
-			self.print(log)
+		while True:
+			view_id, view = self.render_queue.get(self.get_visible_view_ids)
+			timer = StageTimer()
+			try:
+				self.render(view, timer)
+			except Exception as e:
+				# Keep the worker alive for the next renderings
+				self.print("Rendering failed: %s" %e)
+			finally:
+				self.render_queue.done(view_id)
+				self.render_stats.add(self.get_view_name(view), timer,
+									st_settings.get("render_trace_file"))
+
+	def get_view_name(self, view):
+		dot_filepath = view.file_name()
+		if dot_filepath is None:
+			return "untitled (view %d)" %view.id()
+		return os.path.basename(dot_filepath)
+
+	# Views shown in any group of any window
+	def get_visible_view_ids(self):
+		visible_view_ids = set()
+		for window in sublime.windows():
+			for group in range(window.num_groups()):
+				view = window.active_view_in_group(group)
+				if view is not None:
+					visible_view_ids.add(view.id())
+		return visible_view_ids
+
+	def render(self, view, timer):
+		# Get the contents of the whole file
+		region = sublime.Region(0, view.size())
+		contents = view.substr(region)
+		image_filepath = get_image_filepath(st_settings, view)
+		timer.lap("substr")
+		# Reuse the image if the same contents have been rendered before
+		cache_size = st_settings.get("render_cache_size") * 1024 * 1024
+		if cache_size > 0:
+			cache_key = RenderCache.make_key(contents, self.get_layout_engine(view),
+								get_output_format(st_settings, view),
+								get_dot_version(st_settings.get("dot_cmd_path")),
+								self.get_cwd(view))
+			image = self.render_cache.get(cache_key)
+			timer.lap("cache")
+			if image is not None:
+				self.print("Syntax check passed (cached image)")
+				self.publish(image_filepath, image)
+				timer.lap("publish")
+				return
+
+		if st_settings.get("speculative_rendering"):
+			# Run dot while the syntax is being checked, so the latency is the
+			# longer of the two instead of their sum. If the syntax turns out to be
+			# invalid, dot is killed and its output is discarded.
+			process = self.spawn_dot(view)
+			timer.lap("spawn")
+			result = []
+			def run_dot():
+				try:
+					result.append(self.run_dot(view, process, contents))
+				except Exception as e:
+					result.append(e)
+			dot_runner = threading.Thread(target=run_dot)
+			dot_runner.start()
+			syntax_is_valid = False
+			try:
+				syntax_is_valid = self.check_syntax(view, contents)
+				timer.lap("check")
+			finally:
+				# Neither dot nor its runner may outlive a failed check
+				if not syntax_is_valid:
+					process.kill()
+				dot_runner.join()
+			timer.lap("dot")
+			if isinstance(result[0], Exception):
+				raise result[0]
+			image, stderr, timed_out = result[0]
+			if not syntax_is_valid:
+				self.debouncer.record_duration(view.id(), timer.total())
+				return
+		else:
+			syntax_is_valid = self.check_syntax(view, contents)
+			timer.lap("check")
+			# The check alone paces the edits of a large graph while it is invalid
 			if not syntax_is_valid:
-				continue
-
-			'''
-			For purpose of cross-platform, we can't use TemporaryFile class because
-			subprocess can't read it directly on Windows. Using a regular file is a
-			good choice.
-			'''
-			with open(file=self.intermediate_file, mode="w", encoding="utf-8") as fd:
-				fd.write(contents)
-
-			cmd = [st_settings.get("dot_cmd_path"), self.intermediate_file,
-					"-K" + self.get_layout_engine(view),
-					"-T" + get_output_format(st_settings, view),
-					"-o", get_image_filepath(st_settings, view)]
-			# For Windows, we must use startupinfo to hide the console window.
-			startupinfo = None
-			if os.name == "nt":
-				startupinfo = subprocess.STARTUPINFO()
-				startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-			# Default cwd is Sublime Text installation directory, such as `D:\Sublime Text`
-			# We change it to the directory the same as dot file. See issue #16.
-			process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
-											stderr=subprocess.PIPE,
-											startupinfo=startupinfo,
-											cwd=self.get_cwd(view))
-			# Terminate the dot process if it takes too long to complete.
+				self.debouncer.record_duration(view.id(), timer.total())
+				return
+			# Don't spawn dot for contents that are already obsolete
+			if self.is_queued(view):
+				return
+			process = self.spawn_dot(view)
+			timer.lap("spawn")
+			image, stderr, timed_out = self.run_dot(view, process, contents)
+			timer.lap("dot")
+
+		# The rendering was cancelled by rendering(), and the newer revision is
+		# queued, or by on_close()
+		if self.is_queued(view) or not view.is_valid():
+			return
+		if len(stderr) != 0:
+			self.print(stderr.decode().strip())
+		# An image truncated by the timeout is useless
+		if timed_out or len(image) == 0:
+			return
+		self.publish(image_filepath, image)
+		timer.lap("publish")
+		if cache_size > 0 and process.returncode == 0:
+			self.render_cache.put(cache_key, image, cache_size)
+			timer.lap("cache")
+		self.debouncer.record_duration(view.id(), timer.total())
+
+	# Build the DFAs of the syntax checker before the first edit
+	def warm_up_checker(self):
+		syntaxchecker = get_syntaxchecker()
+		with self.check_lock:
+			if st_settings.get("persist_checker_dfa"):
+				try:
+					syntaxchecker.load_dfa(self.get_dfa_filepath())
+				except Exception as e:
+					print("Graphvizer: can't restore the syntax checker state: %s" %e)
+				self.saved_dfa_size = syntaxchecker.get_dfa_size()
+			syntaxchecker.warm_up()
+		sublime.set_timeout_async(self.save_checker_dfa_periodically, DFA_SAVE_INTERVAL * 1000)
+
+	def get_dfa_filepath(self):
+		return os.path.join(sublime.cache_path(), "Graphvizer", "checker_dfa.pickle")
+
+	# Save the DFAs of the syntax checker if they have grown since the last time
+	# Skip the save if the checker is still busy after `timeout` seconds
+	def save_checker_dfa(self, timeout=-1):
+		if not st_settings.get("persist_checker_dfa") or syntaxchecker is None:
+			return
+		if not self.check_lock.acquire(timeout=timeout):
+			return
+		try:
+			dfa_size = syntaxchecker.get_dfa_size()
+			if dfa_size == self.saved_dfa_size:
+				return
 			try:
-				stdout, stderr = process.communicate(timeout=st_settings.get("dot_timeout"))
-			except subprocess.TimeoutExpired:
+				syntaxchecker.save_dfa(self.get_dfa_filepath())
+				self.saved_dfa_size = dfa_size
+			except OSError as e:
+				print("Graphvizer: can't save the syntax checker state: %s" %e)
+		finally:
+			self.check_lock.release()
+
+	# Sublime Text doesn't always unload plugins when it exits
+	def save_checker_dfa_periodically(self):
+		if self.unloaded:
+			return
+		self.save_checker_dfa()
+		sublime.set_timeout_async(self.save_checker_dfa_periodically, DFA_SAVE_INTERVAL * 1000)
+
+	# Check if the syntax is valid
+	def check_syntax(self, view, contents):
+		with self.check_lock:
+			syntax_is_valid, log = get_syntaxchecker().check(contents, view.id())
+			self.limit_checker_memory()
+		self.print(log)
+		return syntax_is_valid
+
+	# What the syntax checker learns about the grammar is kept for the whole
+	# session and grows with the inputs, e.g. deeply nested subgraphs. If it takes
+	# more than `checker_memory_limit`, it is dropped and the grammar is learned
+	# again in the background. Measuring walks the state, so it is only done once
+	# the state has grown by an eighth. The caches of the documents get what the
+	# learned state leaves of the limit. Call with check_lock held.
+	def limit_checker_memory(self):
+		limit = st_settings.get("checker_memory_limit") * 1024 * 1024
+		if limit <= 0:
+			return
+		count = syntaxchecker.count_learned_state()
+		if self.measured_state_count is None or count > self.measured_state_count * 9 // 8:
+			self.measured_state_count = count
+			self.learned_state_size = sum(row[2] for row in syntaxchecker.measure_learned_state())
+			if self.learned_state_size > limit:
+				syntaxchecker.reset_learned_state()
+				self.measured_state_count = None
+				self.checker_resets += 1
+				print("Graphvizer: the syntax checker state took %.1f MB, more than checker_memory_limit. "
+						"It has been reset." %(self.learned_state_size / 1024 / 1024))
+				self.learned_state_size = 0
+				threading.Thread(target=self.rewarm_checker, daemon=True).start()
+		syntaxchecker.trim_document_caches(limit - self.learned_state_size)
+
+	def rewarm_checker(self):
+		with self.check_lock:
+			syntaxchecker.warm_up()
+
+	# Memory taken by the syntax checker, for Tools->Graphvizer->Show Syntax Checker Memory.
+	# It waits for the running check, so don't call it from the UI thread.
+	def checker_memory_report(self):
+		if syntaxchecker is None:
+			return "The syntax checker hasn't been loaded yet"
+		with self.check_lock:
+			rows = syntaxchecker.measure_learned_state() + syntaxchecker.measure_document_caches()
+		lines = ["Syntax checker memory", ""]
+		lines.append("  %-24s %8s %8s" %("", "objects", "MB"))
+		for name, count, size in rows:
+			lines.append("  %-24s %8d %8.2f" %(name, count, size / 1024 / 1024))
+		lines.append("  %-24s %8s %8.2f" %("Total", "", sum(row[2] for row in rows) / 1024 / 1024))
+		limit = st_settings.get("checker_memory_limit")
+		lines.append("  Limit: %s, reset %d times" %("%d MB" %limit if limit > 0 else "none",
+														self.checker_resets))
+		return "\n".join(lines)
+
+	def spawn_dot(self, view):
+		# The contents are piped to dot and the image is read back from its stdout,
+		# so no intermediate file is needed and concurrent renderings can't clobber
+		# each other's input.
+		cmd = [st_settings.get("dot_cmd_path"),
+				"-K" + self.get_layout_engine(view),
+				"-T" + get_output_format(st_settings, view)]
+		# For Windows, we must use startupinfo to hide the console window.
+		startupinfo = None
+		if os.name == "nt":
+			startupinfo = subprocess.STARTUPINFO()
+			startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+		# Default cwd is Sublime Text installation directory, such as `D:\Sublime Text`
+		# We change it to the directory the same as dot file. See issue #16.
+		process = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+										stdout=subprocess.PIPE,
+										stderr=subprocess.PIPE,
+										startupinfo=startupinfo,
+										cwd=self.get_cwd(view))
+		with self.lock:
+			self.running_process[view.id()] = process
+			# A newer revision may have been queued while dot was starting
+			if self.is_queued(view):
 				process.kill()
-				stdout, stderr = process.communicate()
-			if len(stdout) != 0:
-				self.print(stdout.decode().strip())
-			if len(stderr) != 0:
-				self.print(stderr.decode().strip())
+		return process
 
-	def rendering(self, view):
-		self.lock.acquire()
+	# Feed the contents to dot and wait for the image.
+	# Return the image, the messages of dot and whether dot timed out.
+	def run_dot(self, view, process, contents):
+		# Terminate the dot process if it takes too long to complete.
+		timed_out = False
 		try:
-			for v in self.queued_view:
-				if view.id() == v.id():
-					return
-			self.queued_view.append(view)
+			image, stderr = process.communicate(input=contents.encode("utf-8"),
+												timeout=st_settings.get("dot_timeout"))
+		except subprocess.TimeoutExpired:
+			process.kill()
+			image, stderr = process.communicate()
+			timed_out = True
 		finally:
-			self.lock.release()
+			with self.lock:
+				del self.running_process[view.id()]
+		return image, stderr, timed_out
+
+	# Replace the image only if it has changed, so that the image view isn't
+	# reloaded for nothing.
+	def publish(self, image_filepath, image):
+		try:
+			publish_image(image_filepath, image)
+		except OSError as e:
+			self.print("Failed to save the image: %s" %e)
 
-		self.semaphore.release()
+	def is_queued(self, view):
+		return self.render_queue.is_queued(view.id())
+
+	def rendering(self, view):
+		with self.lock:
+			# The image being rendered is obsolete. Kill dot so that the worker can
+			# start rendering the newer revision immediately.
+			process = self.running_process.get(view.id())
+			if process is not None:
+				process.kill()
+			self.render_queue.put(view.id(), view)
+
+	# Wait for a quiet period before rendering so that a burst of edits only
+	# triggers a single rendering. The delay grows with the time the recent
+	# renderings of this view took, and the image never lags behind the text for
+	# much longer than `render_delay_max` seconds.
+	def debounced_rendering(self, view):
+		delay = self.debouncer.touch(view.id(), st_settings.get("render_delay_min"),
+									st_settings.get("render_delay_max"),
+									st_settings.get("render_delay_factor"))
+		change_count = view.change_count()
+		sublime.set_timeout_async(lambda: self.on_quiet_period_end(view, change_count),
+									int(delay * 1000))
+
+	def on_quiet_period_end(self, view, change_count):
+		if not view.is_valid(): # view has been closed
+			return
+		# A newer edit has arrived and its own timer will fire later
+		if view.change_count() != change_count \
+				and not self.debouncer.is_overdue(view.id(), st_settings.get("render_delay_max")):
+			return
+		self.debouncer.clear(view.id())
+		self.rendering(view)
 
 	def on_modified(self, view):
 		'''
@@ -146,7 +429,7 @@ class CoreListener(sublime_plugin.EventListener):
 		if file_syntax != "Packages/Graphviz/DOT.sublime-syntax":
 			return
 		if st_settings.get("render_in_realtime"):
-			self.rendering(view)
+			self.debounced_rendering(view)
 
 	# Update the image_filepath and trigger rendering when the file is saved on disk for the first time.
 	def on_pre_save(self, view):
@@ -187,6 +470,20 @@ class CoreListener(sublime_plugin.EventListener):
 			if st_settings.get("render_in_realtime"):
 				self.rendering(view)
 
+	def on_activated(self, view):
+		self.render_queue.set_active(view.id())
+
+	def on_close(self, view):
+		self.debouncer.forget(view.id())
+		with self.lock:
+			# The image of a closed view is useless
+			process = self.running_process.get(view.id())
+			if process is not None:
+				process.kill()
+			self.render_queue.cancel(view.id())
+		if syntaxchecker is not None: # otherwise nothing has been checked
+			syntaxchecker.forget(view.id())
+
 	def print(self, text):
 		# Get the active window as current main window
 		current_window = sublime.active_window()
@@ -0,0 +1,153 @@
+from ..antlr4.PredictionContext import PredictionContext, SingletonPredictionContext, ArrayPredictionContext
+from ..antlr4.atn.ATNConfig import ATNConfig
+from ..antlr4.atn.ATNConfigSet import ATNConfigSet
+from ..antlr4.atn.ATNSimulator import ATNSimulator
+from ..antlr4.atn.SemanticContext import SemanticContext
+from ..antlr4.dfa.DFAState import DFAState
+
+
+# Convert the DFAs learned by a parser to plain tuples and lists, and back.
+# The runtime objects can't be pickled as they are: the hash codes of the
+# prediction contexts are cached in the objects and derive from hash(""), which
+# changes from one process to another. The objects are rebuilt instead, so their
+# hash codes are computed again. ATN states are referred to by number.
+
+# Indexes of missing objects and of the error state
+MISSING = -1
+ERROR_EDGE = -2
+
+
+# Return the DFAs as plain data, or None if they hold semantic predicates, which
+# DOT doesn't have and which aren't supported.
+def dump_dfa(decisionsToDFA):
+	contexts = ContextTable()
+	dfas = []
+	for dfa in decisionsToDFA:
+		if dfa.precedenceDfa:
+			return None
+		numbers = {} # DFA state -> its index in `states`
+		for index, state in enumerate(dfa.states):
+			numbers[id(state)] = index
+		states = []
+		for state in dfa.states:
+			if state.predicates is not None or state.configs.hasSemanticContext:
+				return None
+			configs = state.configs
+			states.append((
+				[(config.state.stateNumber, config.alt, contexts.dump(config.context),
+					config.reachesIntoOuterContext, config.precedenceFilterSuppressed)
+					for config in configs],
+				configs.fullCtx, configs.uniqueAlt, configs.conflictingAlts,
+				None if state.edges is None else [dump_edge(numbers, target) for target in state.edges],
+				state.isAcceptState, state.prediction, state.requiresFullContext
+			))
+		s0 = MISSING if dfa.s0 is None else numbers[id(dfa.s0)]
+		dfas.append((dfa.decision, s0, states))
+	return contexts.entries, dfas
+
+def dump_edge(numbers, target):
+	if target is None:
+		return MISSING
+	if target is ATNSimulator.ERROR:
+		return ERROR_EDGE
+	return numbers[id(target)]
+
+# Fill empty DFAs of the same grammar with the data returned by dump_dfa().
+# The prediction contexts are added to `context_cache`.
+def load_dfa(data, atn, decisionsToDFA, context_cache):
+	entries, dfas = data
+	contexts = []
+	for entry in entries:
+		if entry is None:
+			context = PredictionContext.EMPTY
+		elif isinstance(entry[1], int):
+			parent, returnState = entry
+			context = SingletonPredictionContext.create(get_context(contexts, parent), returnState)
+		else:
+			parents, returnStates = entry
+			context = ArrayPredictionContext([get_context(contexts, parent) for parent in parents], returnStates)
+		contexts.append(context_cache.add(context))
+
+	for decision, s0, dumped_states in dfas:
+		dfa = decisionsToDFA[decision]
+		states = []
+		for dumped_configs, fullCtx, uniqueAlt, conflictingAlts, edges, isAcceptState, prediction, \
+				requiresFullContext in dumped_states:
+			configs = ATNConfigSet(fullCtx)
+			for stateNumber, alt, context, reachesIntoOuterContext, precedenceFilterSuppressed in dumped_configs:
+				config = ATNConfig(atn.states[stateNumber], alt, contexts[context], SemanticContext.NONE)
+				config.reachesIntoOuterContext = reachesIntoOuterContext
+				config.precedenceFilterSuppressed = precedenceFilterSuppressed
+				configs.add(config)
+			configs.uniqueAlt = uniqueAlt
+			configs.conflictingAlts = conflictingAlts
+			configs.setReadonly(True)
+			state = DFAState(len(states), configs)
+			state.edges = edges # resolved below
+			state.isAcceptState = isAcceptState
+			state.prediction = prediction
+			state.requiresFullContext = requiresFullContext
+			states.append(state)
+		for state in states:
+			if state.edges is not None:
+				state.edges = [load_edge(states, target) for target in state.edges]
+		dfa._states = {state: state for state in states}
+		dfa.s0 = None if s0 == MISSING else states[s0]
+
+def load_edge(states, target):
+	if target == MISSING:
+		return None
+	if target == ERROR_EDGE:
+		return ATNSimulator.ERROR
+	return states[target]
+
+def get_context(contexts, index):
+	return None if index == MISSING else contexts[index]
+
+
+# The prediction contexts of the DFAs. A context is stored after its parents,
+# as (parent, return state) or ([parents], [return states]), and EMPTY as None.
+class ContextTable:
+
+	def __init__(self):
+		self.entries = []
+		self.numbers = {} # id of a context -> its index in `entries`
+
+	# Return the index of the context
+	def dump(self, context):
+		if context is None:
+			return MISSING
+		number = self.numbers.get(id(context))
+		if number is not None:
+			return number
+		# Walk the parents first, without recursion as the graph can be deep
+		pending = [context]
+		while pending:
+			context = pending[-1]
+			if id(context) in self.numbers:
+				pending.pop()
+				continue
+			parents = self.get_parents(context)
+			missing = [parent for parent in parents
+						if parent is not None and id(parent) not in self.numbers]
+			if missing:
+				pending.extend(missing)
+				continue
+			pending.pop()
+			if context is PredictionContext.EMPTY:
+				entry = None
+			elif isinstance(context, SingletonPredictionContext):
+				entry = (self.dump(context.parentCtx), context.returnState)
+			else:
+				entry = ([self.dump(parent) for parent in context.parents], list(context.returnStates))
+			self.numbers[id(context)] = len(self.entries)
+			self.entries.append(entry)
+		return self.numbers[id(context)]
+
+	@staticmethod
+	def get_parents(context):
+		if context is PredictionContext.EMPTY:
+			return []
+		if isinstance(context, SingletonPredictionContext):
+			return [context.parentCtx]
+		return context.parents
@@ -1,5 +1,6 @@
 # Generated from DOT.g4 by ANTLR 4.8
 from ..antlr4 import *
+from .PrebuiltATN import load_atn
 from io import StringIO
 from typing.io import TextIO
 import sys
@@ -116,7 +117,7 @@ def serializedATN():
 
 class DOTLexer(Lexer):
 
-    atn = ATNDeserializer().deserialize(serializedATN())
+    atn = load_atn("DOTLexer", serializedATN())
 
     decisionsToDFA = [ DFA(ds, i) for i, ds in enumerate(atn.decisionToState) ]
 
@@ -1,6 +1,7 @@
 # Generated from DOT.g4 by ANTLR 4.8
 # encoding: utf-8
 from ..antlr4 import *
+from .PrebuiltATN import load_atn
 from io import StringIO
 import sys
 if sys.version_info[1] > 5:
@@ -60,7 +61,7 @@ class DOTParser ( Parser ):
 
     grammarFileName = "DOT.g4"
 
-    atn = ATNDeserializer().deserialize(serializedATN())
+    atn = load_atn("DOTParser", serializedATN())
 
     decisionsToDFA = [ DFA(ds, i) for i, ds in enumerate(atn.decisionToState) ]
 
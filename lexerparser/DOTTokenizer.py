@@ -0,0 +1,229 @@
+import re
+import sys
+from typing import TextIO
+from ..antlr4.InputStream import InputStream
+from ..antlr4.Token import Token
+from ..antlr4.error.Errors import IllegalStateException, LexerNoViableAltException
+from .DOTLexer import DOTLexer
+
+
+LETTER = "a-zA-Z_\u0080-\u00FF\u4e00-\u9fa5"
+
+# One alternative per lexer rule of DOT.g4. No two alternatives can match at
+# the same position except ID and the keywords, and each pattern matches what
+# the ANTLR lexer would match, so the first match is the longest match.
+TOKEN_RE = re.compile("|".join([
+	r"(?P<WS>[ \t\n\r]+)",
+	r"(?P<ID>[" + LETTER + r"][" + LETTER + r"0-9]*)",
+	r"(?P<NUMBER>-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?))",
+	r'(?P<STRING>"(?:\\"|.)*?")',
+	r"(?P<HTML_STRING><(?:<[^>]*>|[^<>])*>)",
+	r"(?P<COMMENT>/\*.*?\*/)",
+	r"(?P<LINE_COMMENT>//.*?\r?\n)",
+	r"(?P<PREPROC>#[^\r\n]*)",
+	r"(?P<LITERAL>->|--|[{};=\[\],:])"
+]), re.DOTALL)
+
+SKIPPED = {"WS", "COMMENT", "LINE_COMMENT", "PREPROC"}
+
+LITERAL_TYPES = {
+	"{": DOTLexer.T__0, "}": DOTLexer.T__1, ";": DOTLexer.T__2, "=": DOTLexer.T__3,
+	"[": DOTLexer.T__4, "]": DOTLexer.T__5, ",": DOTLexer.T__6, "->": DOTLexer.T__7,
+	"--": DOTLexer.T__8, ":": DOTLexer.T__9
+}
+
+KEYWORD_TYPES = {
+	"strict": DOTLexer.STRICT, "graph": DOTLexer.GRAPH, "digraph": DOTLexer.DIGRAPH,
+	"node": DOTLexer.NODE, "edge": DOTLexer.EDGE, "subgraph": DOTLexer.SUBGRAPH
+}
+
+TOKEN_TYPES = {"NUMBER": DOTLexer.NUMBER, "STRING": DOTLexer.STRING,
+				"HTML_STRING": DOTLexer.HTML_STRING}
+
+
+# Length of the common prefix of two strings. Slices are compared by halves,
+# so the characters are compared in C rather than one by one in Python.
+def common_prefix_length(a, b):
+	low, high = 0, min(len(a), len(b))
+	while low < high:
+		mid = (low + high + 1) // 2
+		if a[low:mid] == b[low:mid]:
+			low = mid
+		else:
+			high = mid - 1
+	return low
+
+# Length of the common suffix of two strings, at most `limit`
+def common_suffix_length(a, b, limit):
+	low, high = 0, limit
+	while low < high:
+		mid = (low + high + 1) // 2
+		if a[len(a) - mid:len(a) - low] == b[len(b) - mid:len(b) - low]:
+			low = mid
+		else:
+			high = mid - 1
+	return low
+
+# Number of tokens ending before the character at `pos`, excluding the one
+# right before it
+def count_tokens_before(tokens, pos):
+	low, high = 0, len(tokens)
+	while low < high:
+		mid = (low + high) // 2
+		if tokens[mid].stop + 1 < pos:
+			low = mid + 1
+		else:
+			high = mid
+	return low
+
+
+# A drop-in replacement of DOTLexer that scans with a compiled regular expression
+# instead of simulating the lexer ATN one character at a time. It emits the same
+# tokens (type, channel, start/stop index, line and column) and reports the same
+# token recognition errors as DOTLexer.
+class DOTTokenizer(DOTLexer):
+
+	def __init__(self, input=None, output:TextIO = sys.stdout):
+		super().__init__(input, output)
+		self._pos = 0 # index of the next character to scan
+		self._line = 1
+		self._column = 0
+
+	def reset(self):
+		super().reset()
+		self._pos = 0
+		self._line = 1
+		self._column = 0
+
+	def nextToken(self):
+		if self._input is None:
+			raise IllegalStateException("nextToken requires a non-null input stream.")
+		data = self._input.strdata
+		size = len(data)
+		pos = self._pos
+		while True:
+			if pos >= size:
+				self._pos = pos
+				return self._factory.create(self._tokenFactorySourcePair, Token.EOF, None,
+								Token.DEFAULT_CHANNEL, size, size - 1, self._line, self._column)
+			match = TOKEN_RE.match(data, pos)
+			if match is None:
+				pos = self.recover_from(data, pos)
+				continue
+			end = match.end()
+			rule = match.lastgroup
+			if rule in SKIPPED:
+				self.advance(data, pos, end)
+				pos = end
+				continue
+			if rule == "LITERAL":
+				ttype = LITERAL_TYPES[match.group()]
+			elif rule == "ID":
+				ttype = KEYWORD_TYPES.get(match.group().lower(), DOTLexer.ID)
+			else:
+				ttype = TOKEN_TYPES[rule]
+			token = self._factory.create(self._tokenFactorySourcePair, ttype, None,
+								Token.DEFAULT_CHANNEL, pos, end - 1, self._line, self._column)
+			self.advance(data, pos, end)
+			self._pos = end
+			return token
+
+	# Return all the tokens of `data`, ending with EOF.
+	# If `old_tokens` are the tokens of `old_data`, only the edited part is lexed
+	# again: from the token before the edit until a token starts where a token of
+	# the old revision started after the edit. The lexer has no modes, so from
+	# there on the tokens are the old ones, moved by the length of the edit.
+	# `old_tokens` are updated in place and must not be used afterwards.
+	def tokenize(self, data, old_data=None, old_tokens=None):
+		self.inputStream = InputStream(data)
+		if old_tokens is None:
+			tokens = []
+			while True:
+				token = self.nextToken()
+				tokens.append(token)
+				if token.type == Token.EOF:
+					return tokens
+
+		prefix = common_prefix_length(old_data, data)
+		suffix = common_suffix_length(old_data, data, min(len(old_data), len(data)) - prefix)
+		delta = len(data) - len(old_data)
+		edit_end = len(data) - suffix
+		# The token right before the edit is lexed again, the edit may extend it
+		kept = count_tokens_before(old_tokens, prefix)
+		# A string ending with \" is only cut there because no other " follows it,
+		# so it is the last " before the edit. Inserting a " extends it.
+		quote = old_data.rfind('"', 0, prefix)
+		if quote > 0 and old_data[quote - 1] == "\\":
+			kept = min(kept, count_tokens_before(old_tokens, quote + 1))
+		if kept > 0:
+			last = old_tokens[kept - 1]
+			self._line, self._column = last.line, last.column
+			self.advance(data, last.start, last.stop + 1)
+			self._pos = last.stop + 1
+		tokens = old_tokens[:kept]
+		index = kept # old token to compare with
+		while True:
+			token = self.nextToken()
+			if token.start >= edit_end:
+				old_start = token.start - delta
+				while old_tokens[index].start < old_start:
+					index += 1
+				# At the latest, EOF starts where the old EOF started
+				if old_tokens[index].start == old_start:
+					break
+			tokens.append(token)
+
+		# Move the tokens after the edit and attach all the reused tokens to the
+		# new input stream, which their text is read from.
+		source = self._tokenFactorySourcePair
+		for old in tokens[:kept]:
+			old.source = source
+		line = old_tokens[index].line
+		line_delta = token.line - line
+		column_delta = token.column - old_tokens[index].column
+		for old in old_tokens[index:]:
+			if old.line == line:
+				old.column += column_delta
+			old.line += line_delta
+			old.start += delta
+			old.stop += delta
+			old.source = source
+			tokens.append(old)
+		return tokens
+
+	# Update the line and column after consuming data[start:end]
+	def advance(self, data, start, end):
+		newlines = data.count("\n", start, end)
+		if newlines == 0:
+			self._column += end - start
+		else:
+			self._line += newlines
+			self._column = end - data.rindex("\n", start, end) - 1
+
+	# No rule matches at `pos`. Like the ATN lexer, report the characters up to
+	# the one no rule can continue with, skip them and that character too.
+	# Return the position to resume at.
+	def recover_from(self, data, pos):
+		size = len(data)
+		c = data[pos]
+		nxt = data[pos + 1] if pos + 1 < size else ""
+		if c in "\"<":
+			# Unterminated string. Every character can continue it.
+			dead = size
+		elif c == "/":
+			dead = size if nxt in ("*", "/") else pos + 1
+		elif c == "-":
+			# "-." must be followed by a digit
+			dead = pos + 2 if nxt == "." else pos + 1
+		elif c == ".":
+			dead = pos + 1
+		else:
+			dead = pos
+		stop = min(dead, size - 1)
+		text = data[pos:stop + 1]
+		msg = "token recognition error at: '" + self.getErrorDisplay(text) + "'"
+		e = LexerNoViableAltException(self, self._input, pos, None)
+		self.getErrorListenerDispatch().syntaxError(self, None, self._line, self._column, msg, e)
+		resume = min(dead + 1, size)
+		self.advance(data, pos, resume)
+		return resume
@@ -0,0 +1,53 @@
+import hashlib
+import os
+import pickle
+import sys
+from ..antlr4.atn.ATNDeserializer import ATNDeserializer
+
+
+# The ATN of each generated recognizer is pickled next to its module, so
+# importing the recognizer loads the ATN with a single read instead of
+# deserializing serializedATN() and verifying it.
+# After generating the recognizers again or increasing FORMAT, rebuild the files
+# from the directory containing the Graphvizer package:
+#     python -m Graphvizer.lexerparser.PrebuiltATN
+# A file built from another grammar or format is ignored, as is a file that
+# can't be read, e.g. in a packed .sublime-package: the ATN is then deserialized.
+
+RECOGNIZERS = ["DOTLexer", "DOTParser"]
+
+# pickle protocol readable by every Python version Sublime Text ships
+PROTOCOL = 4
+
+# Increase when the runtime classes pickled with the ATN change
+FORMAT = 2
+
+def get_atn_filepath(recognizer):
+	return os.path.join(os.path.dirname(__file__), recognizer + ".atn")
+
+def get_version(serialized):
+	return "%d:%s" %(FORMAT, hashlib.sha256(serialized.encode("utf-8")).hexdigest())
+
+# Return the ATN of the recognizer
+def load_atn(recognizer, serialized):
+	try:
+		version, atn = pickle.loads(__loader__.get_data(get_atn_filepath(recognizer)))
+		if version == get_version(serialized):
+			return atn
+	except Exception:
+		pass
+	return ATNDeserializer().deserialize(serialized)
+
+def build():
+	# Pickling walks the ATN states recursively
+	sys.setrecursionlimit(max(sys.getrecursionlimit(), 20000))
+	for recognizer in RECOGNIZERS:
+		module = __import__(__package__ + "." + recognizer, fromlist=["serializedATN"])
+		serialized = module.serializedATN()
+		atn = ATNDeserializer().deserialize(serialized)
+		with open(file=get_atn_filepath(recognizer), mode="wb") as fd:
+			pickle.dump((get_version(serialized), atn), fd, PROTOCOL)
+		print("Built %s" %get_atn_filepath(recognizer))
+
+if __name__ == '__main__':
+	build()
@@ -0,0 +1,464 @@
+from ..antlr4 import *
+from ..antlr4.error.ErrorListener import ErrorListener
+from ..antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from ..antlr4.ListTokenSource import ListTokenSource
+from ..antlr4.PredictionContext import ArrayPredictionContext
+from . import DFASerializer
+from .DOTLexer import DOTLexer
+from .DOTParser import DOTParser, serializedATN
+from .DOTTokenizer import DOTTokenizer
+from collections import OrderedDict
+from itertools import islice
+import hashlib
+import os
+import pickle
+import sys
+import threading
+
+
+# Report lexical and syntactic errors
+class DOTErrorListener(ErrorListener):
+	def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+		if isinstance(recognizer, DOTLexer):
+			who = "Lexical Error:"
+		elif isinstance(recognizer, DOTParser):
+			who = "Syntactic Error:"
+		raise Exception("%s line %d, column %d: %s" %(who, line, column, msg))
+
+	def reportAmbiguity(self, recognizer, dfa, startIndex, stopIndex, exact, ambigAlts, configs):
+		pass
+
+	def reportAttemptingFullContext(self, recognizer, dfa, startIndex, stopIndex, conflictingAlts, configs):
+		pass
+
+	def reportContextSensitivity(self, recognizer, dfa, startIndex, stopIndex, prediction, configs):
+		pass
+
+# A lexer/parser pair reused for every check. Constructing them and their
+# listeners on every keystroke is wasted work, so each checker keeps its own
+# pair and only resets it with the new input.
+class SyntaxChecker:
+	def __init__(self):
+		# Same tokens as DOTLexer, but several times faster
+		self.lexer = DOTTokenizer(None)
+		self.lexer.removeErrorListeners()
+		self.lexer.addErrorListener(DOTErrorListener())
+		self.parser = DOTParser(None)
+		# Only the verdict and the first error are needed. Without parse trees,
+		# the rule contexts don't keep their children and no terminal node is
+		# created for each token, so a check allocates a fraction of the memory.
+		self.parser.buildParseTrees = False
+		self.error_listener = DOTErrorListener()
+		self.bail_strategy = BailErrorStrategy()
+		self.default_strategy = DefaultErrorStrategy()
+
+	# This is the core function.
+	# The input is first parsed with SLL prediction, which is much cheaper than
+	# full LL and enough for almost all DOT files, and the parse bails out at
+	# the first error. Only if it fails, the input is parsed again with full LL
+	# and the default error reporting, so the verdict and the error message are
+	# the same as a single LL parse: SLL never accepts an input LL rejects.
+	# `key` identifies the document. The tokens of its last check are reused for
+	# the parts that haven't changed since, and the statements that have already
+	# been checked aren't parsed again.
+	def check(self, dot, key=None):
+		try:
+			old_dot, old_tokens = token_cache.pop(key)
+			statements = None
+			try:
+				tokens = self.lexer.tokenize(dot, old_dot, old_tokens)
+			except Exception:
+				# The old tokens are only updated once the whole input is lexed, so
+				# they can still be reused for the next revision.
+				if old_tokens is not None:
+					token_cache.put(key, old_dot, old_tokens)
+				# Lexical error. LL may report a syntactic error before reaching it.
+				self.lexer.inputStream = InputStream(dot)
+				stream = CommonTokenStream(self.lexer)
+			else:
+				token_cache.put(key, dot, tokens)
+				statements = split_statements(dot, tokens)
+				if statements is not None and self.check_statements(tokens, statements):
+					return True, "Syntax check passed"
+				stream = CommonTokenStream(ListTokenSource(tokens))
+				try:
+					self.parse(stream, PredictionMode.SLL, self.bail_strategy, None)
+					self.add_statements(statements)
+					return True, "Syntax check passed"
+				except Exception:
+					# Syntax errors cancel the SLL parse, and anything else (e.g. a
+					# RecursionError) is left for the LL parse to report
+					stream.seek(0) # the tokens are reused
+			try:
+				self.parse(stream, PredictionMode.LL, self.default_strategy, self.error_listener)
+				self.add_statements(statements)
+				return True, "Syntax check passed"
+			except Exception as e:
+				return False, str(e)
+		finally:
+			self.release()
+
+	# The graph is valid if each of its top-level statements is. Only the
+	# statements that aren't known to be valid are parsed, each on its own.
+	# Return False if one of them is invalid, or if so many have changed that a
+	# single parse of the graph is cheaper. The error is then reported by the
+	# parse of the whole graph.
+	def check_statements(self, tokens, statements):
+		changed = statement_cache.missing(statements)
+		if len(changed) > max(1, len(statements) // 4):
+			return False
+		for text, start, stop in changed:
+			stream = CommonTokenStream(ListTokenSource(tokens[start:stop]))
+			try:
+				self.prepare(stream, PredictionMode.SLL, self.bail_strategy, None)
+				self.parser.stmt_list()
+			except Exception: # e.g. a RecursionError, reported by the parse of the graph
+				return False
+			if stream.LA(1) != Token.EOF:
+				return False
+		self.add_statements(changed)
+		return True
+
+	# The statements of a valid graph are valid
+	def add_statements(self, statements):
+		if statements is not None:
+			statement_cache.add(text for text, start, stop in statements)
+
+	def parse(self, stream, prediction_mode, error_strategy, error_listener):
+		self.prepare(stream, prediction_mode, error_strategy, error_listener)
+		self.parser.graph()
+
+	# The recognizers are kept for the next check, but not the input of the last
+	# one: it can take hundreds of MB for a large graph.
+	def release(self):
+		self.parser.setTokenStream(None) # also drops the rule contexts
+		self.parser._interp._input = None
+		self.parser._interp._outerContext = None
+		self.lexer.inputStream = None
+
+	def prepare(self, stream, prediction_mode, error_strategy, error_listener):
+		self.parser.removeErrorListeners()
+		if error_listener is not None:
+			self.parser.addErrorListener(error_listener)
+		self.parser._errHandler = error_strategy
+		self.parser._interp.predictionMode = prediction_mode
+		self.parser.setTokenStream(stream) # also resets the error strategy
+
+# Split the tokens of a graph into its top-level statements: the tokens up to
+# each ; outside of the braces of subgraphs, and the tokens before the closing
+# brace of the graph. A ; inside a statement can only be in a subgraph, so the
+# statement list of the graph is valid if and only if each part is a valid
+# statement list. Return the (text, start index, stop index) of the parts, or
+# None if the tokens don't start like a graph or its braces aren't balanced.
+def split_statements(dot, tokens):
+	index = 0
+	if tokens[index].type == DOTParser.STRICT:
+		index += 1
+	if tokens[index].type not in (DOTParser.GRAPH, DOTParser.DIGRAPH):
+		return None
+	index += 1
+	if tokens[index].type in ID_TYPES:
+		index += 1
+	if tokens[index].type != DOTParser.T__0:
+		return None
+	start = index + 1
+	depth = 0
+	statements = []
+	semicolon, left_brace, right_brace = DOTParser.T__2, DOTParser.T__0, DOTParser.T__1
+	for index, token in enumerate(islice(tokens, start, None), start):
+		ttype = token.type
+		if ttype == semicolon:
+			if depth == 0:
+				statements.append((dot[tokens[start].start:token.stop + 1], start, index + 1))
+				start = index + 1
+		elif ttype == left_brace:
+			depth += 1
+		elif ttype == right_brace:
+			if depth == 0:
+				if start < index:
+					statements.append((dot[tokens[start].start:tokens[index - 1].stop + 1], start, index))
+				return statements
+			depth -= 1
+	return None
+
+ID_TYPES = (DOTParser.ID, DOTParser.STRING, DOTParser.HTML_STRING, DOTParser.NUMBER)
+
+# The text of the statements known to be valid, shared by all documents.
+# A statement is parsed the same wherever it is, so it only needs to be checked
+# once. The least recently used ones are dropped beyond MAX_SIZE bytes.
+class StatementCache:
+
+	MAX_SIZE = 32 * 1024 * 1024
+	# Bytes taken by an entry besides its text, measured on CPython 3.8. Most
+	# statements are shorter than that.
+	ENTRY_SIZE = 100
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.entries = OrderedDict() # text -> None, from least to most recently used
+		self.size = 0 # bytes taken by the entries
+
+	# Return the statements that aren't known to be valid
+	def missing(self, statements):
+		with self.lock:
+			changed = []
+			for statement in statements:
+				if statement[0] in self.entries:
+					self.entries.move_to_end(statement[0])
+				else:
+					changed.append(statement)
+			return changed
+
+	def add(self, texts):
+		with self.lock:
+			for text in texts:
+				if text not in self.entries:
+					self.entries[text] = None
+					self.size += self.get_entry_size(text)
+			self.drop_oldest(self.MAX_SIZE)
+
+	# Drop the least recently used entries beyond `max_size` bytes
+	def trim(self, max_size):
+		with self.lock:
+			self.drop_oldest(max_size)
+
+	# trim() with the lock held
+	def drop_oldest(self, max_size):
+		while self.size > max_size:
+			text, value = self.entries.popitem(last=False)
+			self.size -= self.get_entry_size(text)
+
+	def get_entry_size(self, text):
+		return sys.getsizeof(text) + self.ENTRY_SIZE
+
+statement_cache = StatementCache()
+
+# The text and the tokens of the last check of each document, so the next
+# check only lexes the edited part again. Entries are taken out while they are
+# used, since the tokens are updated in place, and the least recently checked
+# documents are dropped beyond MAX_ENTRIES documents or MAX_SIZE bytes. The
+# tokens of a document larger than MAX_ENTRY_SIZE, about 600 KB of DOT, aren't
+# kept: it is lexed again in full.
+class TokenCache:
+
+	MAX_ENTRIES = 8
+	MAX_SIZE = 64 * 1024 * 1024
+	MAX_ENTRY_SIZE = 32 * 1024 * 1024
+	# Bytes taken by a token with its list item and its int fields, measured on
+	# CPython 3.8
+	TOKEN_SIZE = 200
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.entries = OrderedDict() # key -> (text, tokens, bytes)
+		self.size = 0 # bytes taken by the entries
+
+	# Return the text and the tokens of `key` and remove them, or (None, None)
+	def pop(self, key):
+		with self.lock:
+			return self.pop_entry(key)
+
+	# pop() with the lock held
+	def pop_entry(self, key):
+		text, tokens, size = self.entries.pop(key, (None, None, 0))
+		self.size -= size
+		return text, tokens
+
+	def put(self, key, text, tokens):
+		if key is None:
+			return
+		size = sys.getsizeof(text) + sys.getsizeof(tokens) + len(tokens) * self.TOKEN_SIZE
+		if size > self.MAX_ENTRY_SIZE:
+			return
+		with self.lock:
+			self.pop_entry(key)
+			self.entries[key] = (text, tokens, size)
+			self.size += size
+			self.drop_oldest(self.MAX_SIZE)
+
+	# Drop the least recently checked documents beyond `max_size` bytes
+	def trim(self, max_size):
+		with self.lock:
+			self.drop_oldest(max_size)
+
+	# trim() with the lock held
+	def drop_oldest(self, max_size):
+		while len(self.entries) > self.MAX_ENTRIES or self.size > max_size:
+			text, tokens, size = self.entries.popitem(last=False)[1]
+			self.size -= size
+
+token_cache = TokenCache()
+
+# Recognizers aren't thread-safe, so each worker thread has its own checker
+local_checker = threading.local()
+def get_checker():
+	checker = getattr(local_checker, "checker", None)
+	if checker is None:
+		checker = local_checker.checker = SyntaxChecker()
+	return checker
+
+def check(dot, key=None):
+	return get_checker().check(dot, key)
+
+# The document has been closed
+def forget(key):
+	token_cache.pop(key)
+
+# Exercise every rule of the grammar once. The lexer and parser DFAs are shared
+# by all recognizers (DOTLexer.decisionsToDFA and DOTParser.decisionsToDFA), so
+# the first real check doesn't have to build them from the ATN.
+WARM_UP_SAMPLES = ['''
+/* warm up */
+strict digraph "G" {
+	// comment
+	# 1 "preprocessor"
+	graph [rankdir=LR, label=<<b>HTML</b> label>];
+	node [shape=box, color="red"] [style=filled]
+	edge [arrowhead=none]
+	size = "7.5,10";
+	a -> b -> c [label="edge \\"label\\"", weight=2];
+	a:p1:n -> b:p2;
+	节点 -> 名字 [label="中文"];
+	subgraph cluster_0 { x; y -- z; -1.5; .5; 3.14 }
+	{ m n } -> subgraph s1 { o } -> p
+}
+''', "graph { a -- b }"]
+# The samples are parsed directly: check() would skip the statements it has
+# already seen, e.g. when the DFAs are learned again after reset_learned_state().
+def warm_up():
+	checker = get_checker()
+	for sample in WARM_UP_SAMPLES:
+		stream = CommonTokenStream(ListTokenSource(checker.lexer.tokenize(sample)))
+		checker.parse(stream, PredictionMode.SLL, checker.bail_strategy, None)
+	checker.release()
+
+# The parser DFAs are saved across sessions, so the checks after a restart are
+# as fast as before it. The file records the version of the ATN it was learned
+# from, and a file saved by another version of the parser is ignored.
+DFA_FORMAT = 1
+def get_dfa_version():
+	sha = hashlib.sha256(serializedATN().encode("utf-8"))
+	return "%d-%s" %(DFA_FORMAT, sha.hexdigest())
+
+# Number of states of the parser DFAs
+def get_dfa_size():
+	return sum(len(dfa.states) for dfa in DOTParser.decisionsToDFA)
+
+# Forget all the parser DFAs
+def reset_dfa():
+	for decision in range(len(DOTParser.decisionsToDFA)):
+		DOTParser.decisionsToDFA[decision] = DFA(DOTParser.atn.getDecisionState(decision), decision)
+
+# Save the parser DFAs. No check may run meanwhile.
+# Return False if they can't be saved.
+def save_dfa(filepath):
+	data = DFASerializer.dump_dfa(DOTParser.decisionsToDFA)
+	if data is None:
+		return False
+	os.makedirs(os.path.dirname(filepath), exist_ok=True)
+	temp_filepath = "%s.%d.tmp" %(filepath, os.getpid())
+	with open(file=temp_filepath, mode="wb") as fd:
+		pickle.dump((get_dfa_version(), data), fd, pickle.HIGHEST_PROTOCOL)
+	os.replace(temp_filepath, filepath)
+	return True
+
+# Replace the parser DFAs with the ones saved by save_dfa(). No check may run
+# meanwhile. Return False if there is no file or it was saved by another
+# version of the parser.
+def load_dfa(filepath):
+	try:
+		with open(file=filepath, mode="rb") as fd:
+			version, data = pickle.load(fd)
+	except FileNotFoundError:
+		return False
+	if version != get_dfa_version():
+		return False
+	reset_dfa()
+	try:
+		DFASerializer.load_dfa(data, DOTParser.atn, DOTParser.decisionsToDFA, DOTParser.sharedContextCache)
+	except Exception:
+		reset_dfa() # don't keep part of a damaged file
+		raise
+	return True
+
+# What the checks have learned about the grammar is shared by all of them for as
+# long as the plugin runs: the DFAs of the lexer and the parser, and the
+# prediction contexts of the parser DFA states. It can be dropped at any time,
+# the next checks learn it again.
+
+# Number of objects of the learned state. It is quick to get, unlike its size.
+def count_learned_state():
+	return get_dfa_size() + sum(len(dfa.states) for dfa in DOTLexer.decisionsToDFA) \
+			+ len(DOTParser.sharedContextCache)
+
+# Memory taken by the learned state, as (name, number of objects, bytes) rows.
+# The objects are walked, so this takes time proportional to their number.
+# No check may run meanwhile.
+def measure_learned_state():
+	rows = []
+	for name, dfas in (("Parser DFA states", DOTParser.decisionsToDFA),
+						("Lexer DFA states", DOTLexer.decisionsToDFA)):
+		count = size = 0
+		for dfa in dfas:
+			size += sys.getsizeof(dfa._states)
+			for state in dfa.states:
+				count += 1
+				size += get_state_size(state)
+		rows.append((name, count, size))
+	contexts = DOTParser.sharedContextCache.cache
+	size = sys.getsizeof(contexts)
+	for context in contexts:
+		size += sys.getsizeof(context)
+		if isinstance(context, ArrayPredictionContext):
+			size += sys.getsizeof(context.parents) + sys.getsizeof(context.returnStates)
+	rows.append(("Prediction contexts", len(contexts), size))
+	return rows
+
+def get_state_size(state):
+	size = sys.getsizeof(state)
+	for edges in (state.edges, state.sparseEdges):
+		if edges is not None:
+			size += sys.getsizeof(edges)
+	configs = state.configs
+	size += sys.getsizeof(configs) + sys.getsizeof(configs.__dict__) + sys.getsizeof(configs.configs)
+	for attr in (configs.configLookup, configs.alts, configs.stateAlts, configs.altSubsets,
+				configs.conflictingAlts):
+		if attr is not None:
+			size += sys.getsizeof(attr)
+	# The contexts are counted with the context cache
+	return size + sum(sys.getsizeof(config) for config in configs)
+
+# Memory taken by the caches of the documents, which have their own limits,
+# as rows like measure_learned_state(). The caches keep their size, so this is
+# quick.
+def measure_document_caches():
+	with statement_cache.lock:
+		rows = [("Valid statements", len(statement_cache.entries), statement_cache.size)]
+	with token_cache.lock:
+		count = sum(len(tokens) for text, tokens, size in token_cache.entries.values())
+		rows.append(("Tokens of %d documents" %len(token_cache.entries), count, token_cache.size))
+	return rows
+
+# Drop the least recently used entries of the caches of the documents until
+# they take at most `max_size` bytes. The tokens go first: they only save
+# lexing, while the statements save parsing and are shared by the documents.
+def trim_document_caches(max_size):
+	token_cache.trim(max(0, max_size - statement_cache.size))
+	statement_cache.trim(max(0, max_size - token_cache.size))
+
+# Forget the learned state. No check may run meanwhile.
+def reset_learned_state():
+	reset_dfa()
+	for decision in range(len(DOTLexer.decisionsToDFA)):
+		DOTLexer.decisionsToDFA[decision] = DFA(DOTLexer.atn.getDecisionState(decision), decision)
+	# The parsers refer to the cache itself
+	DOTParser.sharedContextCache.cache.clear()
+
+if __name__ == '__main__':
+	dot = '''
+	digraph d {
+	a->b;
+	}
+	'''
+	res, log = check(dot)
+	print(log)
@@ -1,8 +1,22 @@
 from .lib import get_image_filepath
 from .lib import get_output_format
+from .lib import publish_image
+from .debouncer import RenderDebouncer
+from .cache import RenderCache
+from .cache import get_dot_version
+from .render_queue import RenderQueue
+from .stats import RenderStats
+from .stats import StageTimer
 
 
 __all__ = [
 	"get_image_filepath",
-	"get_output_format"
+	"get_output_format",
+	"publish_image",
+	"RenderDebouncer",
+	"RenderCache",
+	"get_dot_version",
+	"RenderQueue",
+	"RenderStats",
+	"StageTimer"
 ]
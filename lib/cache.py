@@ -0,0 +1,125 @@
+import hashlib
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from .lib import publish_image
+
+
+# `dot -V` is only run once for each dot command path
+dot_versions = {}
+def get_dot_version(dot_cmd_path):
+	version = dot_versions.get(dot_cmd_path)
+	if version is not None:
+		return version
+	startupinfo = None
+	if os.name == "nt":
+		startupinfo = subprocess.STARTUPINFO()
+		startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+	try:
+		process = subprocess.run([dot_cmd_path, "-V"], stdout=subprocess.PIPE,
+								stderr=subprocess.PIPE, startupinfo=startupinfo, timeout=5)
+		# dot prints its version to stderr
+		version = (process.stdout + process.stderr).decode(errors="replace").strip()
+	except (OSError, subprocess.TimeoutExpired):
+		version = "unknown"
+	dot_versions[dot_cmd_path] = version
+	return version
+
+
+# On-disk LRU cache of rendered images.
+# An image is identified by the hash of everything that affects the output of
+# dot: the DOT source, the layout engine, the output format, the dot version and
+# the working directory (relative paths such as shapefile are resolved against it).
+class RenderCache:
+
+	def __init__(self, cache_dir):
+		self.cache_dir = cache_dir
+		self.lock = threading.Lock()
+		self.entries = None # key -> file size, from least to most recently used
+		self.total_size = 0
+		self.hits = 0
+		self.misses = 0
+
+	@staticmethod
+	def make_key(contents, layout_engine, output_format, dot_version, cwd):
+		sha = hashlib.sha256()
+		for part in (layout_engine, output_format, dot_version, cwd or ""):
+			sha.update(part.encode("utf-8"))
+			sha.update(b"\0")
+		sha.update(contents.encode("utf-8"))
+		return sha.hexdigest()
+
+	def get_cache_filepath(self, key):
+		return os.path.join(self.cache_dir, key)
+
+	# Load the cached images left by previous sessions, the least recently used first
+	def load_entries(self):
+		if self.entries is not None:
+			return
+		self.entries = OrderedDict()
+		os.makedirs(self.cache_dir, exist_ok=True)
+		files = []
+		for entry in os.scandir(self.cache_dir):
+			if entry.is_file() and not entry.name.endswith(".tmp"): # not being written
+				stat = entry.stat()
+				files.append((stat.st_mtime, entry.name, stat.st_size))
+		for mtime, key, size in sorted(files):
+			self.entries[key] = size
+			self.total_size += size
+
+	# Return the cached image, or None if it isn't cached
+	def get(self, key):
+		with self.lock:
+			self.load_entries()
+			if key not in self.entries:
+				self.misses += 1
+				return None
+			cache_filepath = self.get_cache_filepath(key)
+			try:
+				with open(file=cache_filepath, mode="rb") as fd:
+					image = fd.read()
+				os.utime(cache_filepath) # mtime records the last use across sessions
+			except OSError:
+				self.discard(key)
+				self.misses += 1
+				return None
+			self.entries.move_to_end(key)
+			self.hits += 1
+			return image
+
+	# Save the rendered image and evict the least recently used images until the
+	# cache fits in `max_size` bytes.
+	def put(self, key, image, max_size):
+		with self.lock:
+			self.load_entries()
+			size = len(image)
+			if size > max_size:
+				return
+			if key in self.entries:
+				self.discard(key)
+			try:
+				# A concurrent get() from another Sublime Text instance never sees a
+				# half-written image
+				publish_image(self.get_cache_filepath(key), image)
+			except OSError:
+				return
+			self.entries[key] = size
+			self.total_size += size
+			while self.total_size > max_size:
+				self.discard(next(iter(self.entries)))
+
+	def discard(self, key):
+		self.total_size -= self.entries.pop(key)
+		try:
+			os.remove(self.get_cache_filepath(key))
+		except OSError:
+			pass
+
+	def stats(self):
+		with self.lock:
+			lookups = self.hits + self.misses
+			hit_rate = self.hits / lookups * 100 if lookups else 0
+			return "Render cache: %d hits, %d misses, hit rate %.1f%%, %d images, %.1f MB" \
+					%(self.hits, self.misses, hit_rate,
+					len(self.entries or ()), self.total_size / 1024 / 1024)
@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+# Coalesce the edits of each view into a single rendering.
+# The quiet period is derived from how long the recent renderings of the
+# view took, so tiny graphs are rendered almost immediately while heavy graphs
+# wait until the user pauses typing.
+class RenderDebouncer:
+
+	# Weight of the newest measurement in the moving average
+	ALPHA = 0.3
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.first_edit = {} # view id -> time of the oldest edit not rendered yet
+		self.avg_duration = {} # view id -> moving average of rendering duration
+
+	# Record the duration of a finished rendering
+	def record_duration(self, view_id, duration):
+		with self.lock:
+			avg = self.avg_duration.get(view_id)
+			if avg is None:
+				self.avg_duration[view_id] = duration
+			else:
+				self.avg_duration[view_id] = self.ALPHA * duration + (1 - self.ALPHA) * avg
+
+	# Called on every edit. Return the quiet period to wait before rendering.
+	def touch(self, view_id, min_delay, max_delay, factor):
+		with self.lock:
+			self.first_edit.setdefault(view_id, time.monotonic())
+			delay = factor * self.avg_duration.get(view_id, 0)
+		return max(min_delay, min(delay, max_delay))
+
+	# The preview of this view has been stale for too long
+	def is_overdue(self, view_id, max_delay):
+		with self.lock:
+			first_edit = self.first_edit.get(view_id)
+		return first_edit is not None and time.monotonic() - first_edit >= max_delay
+
+	# The pending edits have been handed over to the rendering queue
+	def clear(self, view_id):
+		with self.lock:
+			self.first_edit.pop(view_id, None)
+
+	# The view has been closed
+	def forget(self, view_id):
+		with self.lock:
+			self.first_edit.pop(view_id, None)
+			self.avg_duration.pop(view_id, None)
@@ -1,4 +1,5 @@
 import tempfile
+import threading
 import os
 
 
@@ -37,3 +38,28 @@ def get_image_filepath(st_settings, view):
 								+ "." + get_output_format(st_settings, view)
 
 	return os.path.join(image_dirname, image_basename)
+
+# Write the image to `image_filepath` unless the file already has the same bytes.
+# The image is written to a temporary file in the same directory first and then
+# renamed, so an image viewer never sees a half-written file.
+# Return True if the file has been changed.
+def publish_image(image_filepath, image):
+	try:
+		if os.path.getsize(image_filepath) == len(image):
+			with open(file=image_filepath, mode="rb") as fd:
+				if fd.read() == image:
+					return False
+	except OSError: # image doesn't exist yet
+		pass
+
+	# Unique among threads and Sublime Text instances
+	temp_filepath = "%s.%d-%d.tmp" %(image_filepath, os.getpid(), threading.get_ident())
+	try:
+		with open(file=temp_filepath, mode="wb") as fd:
+			fd.write(image)
+		os.replace(temp_filepath, image_filepath)
+	except OSError:
+		if os.path.exists(temp_filepath):
+			os.remove(temp_filepath)
+		raise
+	return True
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# Work queue of the rendering workers.
+# Items are keyed by view id, so a view is queued at most once and queueing it
+# again only replaces the item with the latest revision. A key taken by a worker
+# is not handed to another worker until done() is called, which keeps the
+# renderings of a view ordered. Every operation is O(1) in the number of queued
+# views, apart from skipping the keys being rendered, of which there are at most
+# as many as workers.
+class RenderQueue:
+
+	# An item waiting for more than STARVATION_TIME seconds goes first
+	STARVATION_TIME = 5
+
+	def __init__(self):
+		self.condition = threading.Condition()
+		self.queued = OrderedDict() # key -> (item, queued time), the oldest first
+		self.running = set() # keys taken by workers
+		self.active_key = None # key of the focused view
+
+	def __len__(self):
+		with self.condition:
+			return len(self.queued)
+
+	# Queue an item or replace the queued item of the same key.
+	# Return False if the key was already queued.
+	def put(self, key, item):
+		with self.condition:
+			queued = self.queued.get(key)
+			if queued is not None:
+				self.queued[key] = (item, queued[1]) # keep its place in the queue
+				return False
+			self.queued[key] = (item, time.monotonic())
+			self.condition.notify()
+			return True
+
+	def is_queued(self, key):
+		with self.condition:
+			return key in self.queued
+
+	# Remove the queued item of this key. Return the item, or None.
+	def cancel(self, key):
+		with self.condition:
+			queued = self.queued.pop(key, None)
+			return None if queued is None else queued[0]
+
+	# Remove all queued items and return them, the oldest first
+	def drain(self):
+		with self.condition:
+			items = [item for item, queued_time in self.queued.values()]
+			self.queued.clear()
+			return items
+
+	def set_active(self, key):
+		with self.condition:
+			self.active_key = key
+
+	# Block until an item can be rendered and take it.
+	# The item of the focused view goes first, then the items of the visible views
+	# and the others at last, each in the order they were queued.
+	# `get_visible_keys` is called without the lock held.
+	def get(self, get_visible_keys):
+		while True:
+			visible_keys = get_visible_keys()
+			with self.condition:
+				key = self.choose(visible_keys)
+				if key is not None:
+					item, queued_time = self.queued.pop(key)
+					self.running.add(key)
+					return key, item
+				self.condition.wait()
+
+	def choose(self, visible_keys):
+		oldest_key = None
+		for key in self.queued: # only skips the keys being rendered
+			if key not in self.running:
+				oldest_key = key
+				break
+		if oldest_key is None:
+			return None
+		if time.monotonic() - self.queued[oldest_key][1] >= self.STARVATION_TIME:
+			return oldest_key
+		if self.active_key in self.queued and self.active_key not in self.running:
+			return self.active_key
+		visible_key, visible_time = None, None
+		for key in visible_keys:
+			if key in self.queued and key not in self.running:
+				queued_time = self.queued[key][1]
+				if visible_time is None or queued_time < visible_time:
+					visible_key, visible_time = key, queued_time
+		if visible_key is not None:
+			return visible_key
+		return oldest_key
+
+	# The worker has finished the item taken by get()
+	def done(self, key):
+		with self.condition:
+			self.running.discard(key)
+			# The queued item of this key can be taken now
+			self.condition.notify_all()
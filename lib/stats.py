@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+from collections import deque, OrderedDict
+
+
+# Measure the stages of a rendering one after another
+class StageTimer:
+
+	def __init__(self):
+		self.start = self.last = time.perf_counter()
+		self.stages = OrderedDict() # stage -> seconds
+
+	# The stage has just finished
+	def lap(self, stage):
+		now = time.perf_counter()
+		self.stages[stage] = self.stages.get(stage, 0) + now - self.last
+		self.last = now
+
+	def total(self):
+		return self.last - self.start
+
+
+def percentile(sorted_values, p):
+	index = max(0, int(round(p / 100 * len(sorted_values))) - 1)
+	return sorted_values[index]
+
+
+# Timings of the recent renderings, kept in a bounded ring
+class RenderStats:
+
+	def __init__(self, max_records=1000):
+		self.lock = threading.Lock()
+		self.records = deque(maxlen=max_records)
+
+	# `trace_filepath` is a JSON lines file the record is appended to, or None
+	def add(self, view_name, timer, trace_filepath=None):
+		record = {
+			"time": time.time(),
+			"view": view_name,
+			"stages": timer.stages,
+			"total": timer.total()
+		}
+		with self.lock:
+			self.records.append(record)
+			if trace_filepath:
+				try:
+					with open(file=trace_filepath, mode="a", encoding="utf-8") as fd:
+						fd.write(json.dumps(record) + "\n")
+				except OSError as e:
+					print("Graphvizer: can't write render trace: %s" %e)
+
+	# Return a table of the p50/p95/p99 latency of each stage, for all views and
+	# for each view, in milliseconds.
+	def report(self):
+		with self.lock:
+			records = list(self.records)
+		if not records:
+			return "No rendering has been recorded yet"
+		groups = OrderedDict()
+		groups["All views"] = records
+		for record in records:
+			groups.setdefault(record["view"], []).append(record)
+
+		lines = ["Render latency of the last %d renderings (ms)" %len(records)]
+		for name, group in groups.items():
+			lines.append("")
+			lines.append("%s (%d renderings)" %(name, len(group)))
+			lines.append("  %-10s %8s %8s %8s %6s" %("stage", "p50", "p95", "p99", "count"))
+			durations = OrderedDict()
+			for record in group:
+				for stage, seconds in record["stages"].items():
+					durations.setdefault(stage, []).append(seconds)
+			durations["total"] = [record["total"] for record in group]
+			for stage, values in durations.items():
+				values.sort()
+				lines.append("  %-10s %8.1f %8.1f %8.1f %6d" %(stage,
+							percentile(values, 50) * 1000, percentile(values, 95) * 1000,
+							percentile(values, 99) * 1000, len(values)))
+		return "\n".join(lines)
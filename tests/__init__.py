@@ -0,0 +1,37 @@
+# Tests of the parts of the plugin that don't need Sublime Text. From the
+# directory of the package:
+#     python -m unittest discover -s tests -t .
+# Sublime Text only loads the plugins at the top of the package, not these.
+import os
+import sys
+import types
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The modules use relative imports, so they are imported from the package
+# `Graphvizer`, whatever the name of its directory is
+if "Graphvizer" not in sys.modules:
+	package = types.ModuleType("Graphvizer")
+	package.__path__ = [ROOT]
+	sys.modules["Graphvizer"] = package
+
+
+# A stand-in for the parts of the sublime module the tested code deals with
+class View:
+
+	def __init__(self, view_id):
+		self.view_id = view_id
+
+	def id(self):
+		return self.view_id
+
+	def is_valid(self):
+		return True
+
+try:
+	import sublime
+except ImportError:
+	sublime = types.ModuleType("sublime")
+	sublime.View = View
+	sys.modules["sublime"] = sublime
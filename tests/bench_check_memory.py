@@ -0,0 +1,47 @@
+# Memory and time of a syntax check of a large graph, with and without parse
+# trees. From the directory of the package:
+#     python -m tests.bench_check_memory [number of edges, 50000 by default]
+import gc
+import sys
+import time
+import tracemalloc
+from Graphvizer.lexerparser import syntaxchecker
+
+
+def make_graph(edge_count):
+	lines = ["digraph G {"]
+	for i in range(edge_count):
+		lines.append('\tn%d -> n%d [label="e%d", weight=%d];' %(i, (i * 7 + 1) % edge_count, i, i % 5))
+	lines.append("}")
+	return "\n".join(lines) + "\n"
+
+# Return the peak and the retained traced memory in bytes and the seconds of a
+# check that parses the whole graph
+def measure(checker, dot):
+	syntaxchecker.statement_cache = syntaxchecker.StatementCache()
+	gc.collect()
+	tracemalloc.start()
+	start = time.perf_counter()
+	valid, log = checker.check(dot)
+	seconds = time.perf_counter() - start
+	gc.collect()
+	retained, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	assert valid, log
+	return peak, retained, seconds
+
+def main():
+	edge_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+	dot = make_graph(edge_count)
+	print("%d edges, %.1f MB of text" %(edge_count, len(dot) / 1024 / 1024))
+	checker = syntaxchecker.SyntaxChecker()
+	checker.check(dot) # learn the DFAs first
+	print("%-18s %10s %14s %8s" %("", "peak MB", "retained MB", "s"))
+	for build_parse_trees in (True, False):
+		checker.parser.buildParseTrees = build_parse_trees
+		peak, retained, seconds = measure(checker, dot)
+		print("%-18s %10.1f %14.1f %8.2f" %("parse trees" if build_parse_trees else "no parse trees",
+						peak / 1024 / 1024, retained / 1024 / 1024, seconds))
+
+if __name__ == '__main__':
+	main()
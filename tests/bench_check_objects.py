@@ -0,0 +1,58 @@
+# Garbage collections, peak memory and time of a syntax check of a large
+# graph. Each size is checked in a fresh interpreter, so the maximum RSS is its
+# own. Unix only. From the directory of the package:
+#     python -m tests.bench_check_objects [numbers of edges, 10000 30000 by default]
+import gc
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from . import ROOT
+from .bench_check_memory import make_graph
+
+
+# Check the graph in this fresh interpreter and print the measurements as JSON
+def check_graph(edge_count):
+	from Graphvizer.lexerparser import syntaxchecker
+	dot = make_graph(edge_count)
+	checker = syntaxchecker.SyntaxChecker()
+	result = {"MB": len(dot) / 1024 / 1024}
+	for run in ("cold", "warm"):
+		# Without a key nor the known statements the whole graph is parsed
+		syntaxchecker.statement_cache = syntaxchecker.StatementCache()
+		gc.collect()
+		collections = gc.get_stats()[0]["collections"]
+		start = time.perf_counter()
+		valid, log = checker.check(dot)
+		result[run + " s"] = time.perf_counter() - start
+		# A collection of the youngest generation runs every 700 net allocations
+		# of container objects
+		result[run + " gen-0"] = gc.get_stats()[0]["collections"] - collections
+		assert valid, log
+	syntaxchecker.statement_cache = syntaxchecker.StatementCache()
+	tracemalloc.start()
+	checker.check(dot)
+	result["peak MB"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+	tracemalloc.stop()
+	# kilobytes on Linux
+	result["max RSS MB"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+	print(json.dumps(result))
+
+def main():
+	if sys.argv[1:2] == ["--child"]:
+		check_graph(int(sys.argv[2]))
+		return
+	edge_counts = [int(arg) for arg in sys.argv[1:]] or [10000, 30000]
+	columns = ["MB", "cold s", "warm s", "cold gen-0", "warm gen-0", "peak MB", "max RSS MB"]
+	print("%-8s" %"edges" + "".join("%12s" %column for column in columns))
+	for edge_count in edge_counts:
+		output = subprocess.check_output([sys.executable, "-m", "tests.bench_check_objects",
+										"--child", str(edge_count)], cwd=ROOT)
+		result = json.loads(output)
+		print("%-8d" %edge_count + "".join(("%12d" if isinstance(result[column], int) else "%12.1f")
+											%result[column] for column in columns))
+
+if __name__ == '__main__':
+	main()
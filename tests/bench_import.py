@@ -0,0 +1,60 @@
+# Time of importing the syntax checker, with the prebuilt ATNs and with the
+# ATNs deserialized from serializedATN(), and of loading each ATN. From the
+# directory of the package:
+#     python -m tests.bench_import [number of imports, 20 by default]
+import statistics
+import subprocess
+import sys
+import time
+from . import ROOT
+
+
+# Import the syntax checker in this fresh interpreter and print the seconds
+def import_checker(prebuilt):
+	start = time.perf_counter()
+	from Graphvizer.lexerparser import PrebuiltATN
+	if not prebuilt:
+		PrebuiltATN.get_atn_filepath = lambda recognizer: "" # can't be read
+	from Graphvizer.lexerparser import syntaxchecker
+	print(time.perf_counter() - start)
+
+def time_import(mode):
+	output = subprocess.check_output([sys.executable, "-m", "tests.bench_import", "--child", mode],
+									cwd=ROOT)
+	return float(output)
+
+# Return the seconds of loading the ATN of a recognizer
+def time_load(module, count, prebuilt):
+	from Graphvizer.antlr4.atn.ATNDeserializer import ATNDeserializer
+	from Graphvizer.lexerparser import PrebuiltATN
+	recognizer = module.__name__.rsplit(".", 1)[-1]
+	serialized = module.serializedATN()
+	start = time.perf_counter()
+	for i in range(count):
+		if prebuilt:
+			PrebuiltATN.load_atn(recognizer, serialized)
+		else:
+			ATNDeserializer().deserialize(serialized)
+	return (time.perf_counter() - start) / count
+
+def main():
+	if sys.argv[1:2] == ["--child"]:
+		import_checker(sys.argv[2] == "prebuilt")
+		return
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+	print("%-24s %10s %10s" %("", "prebuilt", "deserialize"))
+	prebuilt = []
+	deserialized = []
+	# Alternate the two so that both see the same load of the machine
+	for i in range(count):
+		prebuilt.append(time_import("prebuilt"))
+		deserialized.append(time_import("deserialize"))
+	for name, function in (("import min ms", min), ("import median ms", statistics.median)):
+		print("%-24s %10.1f %10.1f" %(name, function(prebuilt) * 1000, function(deserialized) * 1000))
+	from Graphvizer.lexerparser import DOTLexer, DOTParser
+	for module in (DOTLexer, DOTParser):
+		print("%-24s %10.2f %10.2f" %(module.__name__.rsplit(".", 1)[-1] + " ATN load ms",
+						time_load(module, count, True) * 1000, time_load(module, count, False) * 1000))
+
+if __name__ == '__main__':
+	main()
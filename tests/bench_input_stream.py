@@ -0,0 +1,70 @@
+# Memory and time of an InputStream over multi-MB graphs, against a stream
+# keeping a list of the code points as InputStream used to. From the directory
+# of the package:
+#     python -m tests.bench_input_stream [sizes in MB, 5 20 by default]
+import gc
+import sys
+import time
+import tracemalloc
+from Graphvizer.antlr4 import InputStream, Token
+
+
+class CodePointStream(InputStream):
+
+	def _loadString(self):
+		self._index = 0
+		self.data = [ord(c) for c in self.strdata]
+		self._size = len(self.data)
+
+	def LA(self, offset):
+		if offset==0:
+			return 0
+		if offset<0:
+			offset += 1
+		pos = self._index + offset - 1
+		if pos < 0 or pos >= self._size:
+			return Token.EOF
+		return self.data[pos]
+
+# A graph of about `size` bytes. Non-ASCII labels make the string store 2
+# bytes per character.
+def make_graph(size, label):
+	lines = ["digraph G {"]
+	for i in range(size // 50):
+		lines.append('\tnode_%d -> node_%d [label="%s %d"];' %(i, i + 1, label, i))
+	lines.append("}")
+	return "\n".join(lines) + "\n"
+
+# Return the traced memory retained by the stream in bytes, the seconds of
+# creating it and the seconds of reading the first `count` characters
+def measure(stream_class, dot, count):
+	gc.collect()
+	tracemalloc.start()
+	start = time.perf_counter()
+	stream = stream_class(dot)
+	setup = time.perf_counter() - start
+	retained = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	LA = stream.LA
+	consume = stream.consume
+	start = time.perf_counter()
+	for i in range(count):
+		LA(1)
+		consume()
+	return retained, setup, time.perf_counter() - start
+
+def main():
+	sizes = [int(arg) for arg in sys.argv[1:]] or [5, 20]
+	count = 1000000
+	print("%-28s %10s %10s %14s" %("", "stream MB", "setup ms", "Mchar/s read"))
+	for size in sizes:
+		for name, label in (("ASCII", "dependency"), ("non-ASCII", "dépendance")):
+			dot = make_graph(size * 1000000, label)
+			print("%.1f MB graph, %s" %(len(dot) / 1000000, name))
+			for stream_class in (CodePointStream, InputStream):
+				retained, setup, seconds = measure(stream_class, dot, min(count, len(dot)))
+				print("  %-26s %10.1f %10.1f %14.2f" %(stream_class.__name__, retained / 1024 / 1024,
+								setup * 1000, min(count, len(dot)) / seconds / 1000000))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,41 @@
+# Lexing time of a graph with ASCII names and of the same graph with CJK names,
+# whose characters are above the dense DFA edges of the lexer. From the
+# directory of the package:
+#     python -m tests.bench_lex [number of edges, 5000 by default]
+import sys
+import time
+from Graphvizer.antlr4 import CommonTokenStream, InputStream
+from Graphvizer.lexerparser.DOTLexer import DOTLexer
+from Graphvizer.lexerparser.DOTTokenizer import DOTTokenizer
+
+
+def make_graph(edge_count, names):
+	lines = ["digraph G {"]
+	for i in range(edge_count):
+		lines.append('\t%s%d -> %s%d [label="%s %d"]; // %s' %(names[0], i, names[1], i, names[2], i, names[3]))
+	lines.append("}")
+	return "\n".join(lines) + "\n"
+
+# Return the number of tokens and the seconds of lexing the whole graph
+def measure(lexer_class, dot):
+	start = time.perf_counter()
+	stream = CommonTokenStream(lexer_class(InputStream(dot)))
+	stream.fill()
+	return len(stream.tokens), time.perf_counter() - start
+
+def main():
+	edge_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+	graphs = [("ASCII", make_graph(edge_count, ("node", "name", "directed graph", "comment"))),
+			("CJK", make_graph(edge_count, ("节点", "名字", "有向图", "注释")))]
+	print("%d edges" %edge_count)
+	print("%-24s %8s %8s %8s %12s" %("", "tokens", "1st s", "2nd s", "2nd Mchar/s"))
+	for lexer_class in (DOTLexer, DOTTokenizer):
+		for name, dot in graphs:
+			# The first lex also builds the DFA edges of the new characters
+			token_count, first = measure(lexer_class, dot)
+			token_count, second = measure(lexer_class, dot)
+			print("%-24s %8d %8.2f %8.2f %12.2f" %(lexer_class.__name__ + " " + name, token_count,
+							first, second, len(dot) / second / 1000000))
+
+if __name__ == '__main__':
+	main()
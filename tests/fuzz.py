@@ -0,0 +1,48 @@
+import os
+import random
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+# Pieces of DOT, valid or not, inserted by the mutations
+ATOMS = ["a", "_x9", "节点", "é", "12", "-3.5", ".5", "1.2.3", '"str"', '"q\\"x"', '"unterminated',
+		"<b>x</b>", "<<i>y</i>>", "<unbalanced", "strict", "graph", "digraph", "Digraph", "node",
+		"NODE", "edge", "subgraph", "{", "}", "[", "]", "=", ";", ",", ":", "->", "--", "-",
+		"/* c */", "/*", "// lc\n", "# pre\n", "\n", "\r\n", " ", "\t", "@", "$", "\\"]
+
+# Return the (name, text) of the files of the corpus, sorted by name
+def load_corpus():
+	corpus = []
+	for name in sorted(os.listdir(CORPUS_DIR)):
+		with open(file=os.path.join(CORPUS_DIR, name), mode="r", encoding="utf-8", newline="") as fd:
+			corpus.append((name, fd.read()))
+	return corpus
+
+# Apply one to three random edits to `text`: delete a few characters, insert an
+# atom or replace a few characters with one
+def mutate(text, rng):
+	for i in range(rng.randrange(1, 4)):
+		start = rng.randrange(len(text) + 1)
+		op = rng.randrange(3)
+		if op == 0:
+			text = text[:start] + text[start + rng.randrange(1, 6):]
+		elif op == 1:
+			text = text[:start] + rng.choice(ATOMS) + text[start:]
+		else:
+			text = text[:start] + rng.choice(ATOMS) + text[start + rng.randrange(1, 4):]
+	return text
+
+# Random sequences of atoms, most of them invalid
+def random_texts(rng, count, max_atoms=30):
+	return ["".join(rng.choice(ATOMS) for i in range(rng.randrange(1, max_atoms))) for j in range(count)]
+
+# The corpus, `mutation_count` mutations of each file and `random_count` random
+# texts, always the same for a seed
+def fuzzed_corpus(seed, mutation_count, random_count):
+	rng = random.Random(seed)
+	texts = []
+	for name, text in load_corpus():
+		texts.append(text)
+		texts.extend(mutate(text, rng) for i in range(mutation_count))
+	texts.extend(random_texts(rng, random_count))
+	return texts
@@ -0,0 +1,45 @@
+import random
+import unittest
+from Graphvizer.antlr4.PredictionContext import PredictionContext, SingletonPredictionContext
+from Graphvizer.antlr4.atn.ATNConfig import ATNConfig
+from Graphvizer.antlr4.atn.ATNConfigSet import ATNConfigSet
+from Graphvizer.antlr4.atn.PredictionMode import PredictionMode
+from Graphvizer.lexerparser.DOTParser import DOTParser
+
+
+# Stacks of one or two return states, and the empty stack
+def make_contexts():
+	contexts = [PredictionContext.EMPTY]
+	for a in range(1, 5):
+		outer = SingletonPredictionContext.create(PredictionContext.EMPTY, a)
+		contexts.append(outer)
+		for b in range(5, 7):
+			contexts.append(SingletonPredictionContext.create(outer, b))
+	return contexts
+
+def alt_subsets(configs):
+	return sorted(sorted(alts) for alts in PredictionMode.getConflictingAltSubsets(configs))
+
+
+# ATNConfigSet tracks the alt subsets and the alts of each state as configs are
+# added, and the contexts of the configs of a (state, alt, semantic context)
+# are merged. The tracked values must be the ones the scan finds.
+class ATNConfigSetTest(unittest.TestCase):
+
+	def test_tracking_matches_scan(self):
+		rnd = random.Random(25)
+		states = DOTParser.atn.states[1:6]
+		contexts = make_contexts()
+		for i in range(300):
+			configs = ATNConfigSet(fullCtx=rnd.random() < 0.5)
+			for j in range(rnd.randrange(1, 30)):
+				configs.add(ATNConfig(rnd.choice(states), rnd.randrange(1, 4), rnd.choice(contexts)))
+			tracked = (alt_subsets(configs), PredictionMode.hasStateAssociatedWithOneAlt(configs))
+			configs.altSubsets = None
+			configs.stateAlts = None
+			scanned = (alt_subsets(configs), PredictionMode.hasStateAssociatedWithOneAlt(configs))
+			self.assertEqual(tracked, scanned)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,108 @@
+import random
+import unittest
+from Graphvizer.antlr4.IntervalSet import IntervalSet, BITS_MIN, BITS_LIMIT
+
+
+# Values around both ends of the bit span, and far beyond it
+def random_value(rnd, wide):
+	if wide and rnd.random() < 0.2:
+		return rnd.randrange(0x10000, 0x10400)
+	return rnd.randrange(BITS_MIN - 3, BITS_LIMIT + 40)
+
+def random_range(rnd, wide):
+	start = random_value(rnd, wide)
+	return range(start, start + rnd.choice((1, 2, 5, 30, 300)))
+
+# Build a random set, and the set of its members. Only sets with `wide` get
+# members beyond the bit span.
+def random_set(rnd, wide):
+	s = IntervalSet()
+	model = set()
+	for i in range(rnd.randrange(4)):
+		v = random_range(rnd, wide)
+		s.addRange(v)
+		model.update(v)
+	return s, model
+
+
+class IntervalSetTest(unittest.TestCase):
+
+	def assertSameAs(self, s, model, in_bits):
+		self.assertEqual(list(s), sorted(model))
+		self.assertEqual(len(s), len(model))
+		for v in range(BITS_MIN - 3, BITS_LIMIT + 40):
+			self.assertEqual(v in s, v in model, v)
+		# The ranges are sorted and neither overlap nor touch each other
+		intervals = s.intervals or []
+		for i in intervals:
+			self.assertGreater(len(i), 0)
+		for a, b in zip(intervals, intervals[1:]):
+			self.assertLess(a.stop, b.start)
+		if in_bits:
+			self.assertIsNone(s._ranges)
+
+	# Apply random operations to a set and to a Python set, and compare them
+	# after each step. The set stays in the bit mode as long as all of the
+	# members it ever got are in the bit span.
+	def check_random_operations(self, seed, wide):
+		rnd = random.Random(seed)
+		s = IntervalSet()
+		model = set()
+		in_bits = True
+		for step in range(200):
+			operation = rnd.choice(("addOne", "addRange", "addSet", "removeOne",
+									"removeRange", "complement"))
+			if operation == "addOne":
+				v = random_value(rnd, wide)
+				s.addOne(v)
+				model.add(v)
+				in_bits = in_bits and BITS_MIN <= v < BITS_LIMIT
+			elif operation == "addRange":
+				v = random_range(rnd, wide)
+				s.addRange(v)
+				model.update(v)
+				in_bits = in_bits and v.start >= BITS_MIN and v.stop <= BITS_LIMIT
+			elif operation == "addSet":
+				other, other_model = random_set(rnd, wide)
+				s.addSet(other)
+				model |= other_model
+				in_bits = in_bits and other._ranges is None
+			elif operation == "removeOne":
+				v = rnd.choice(sorted(model)) if model and rnd.random() < 0.7 else random_value(rnd, wide)
+				s.removeOne(v)
+				model.discard(v)
+			elif operation == "removeRange":
+				v = random_range(rnd, wide)
+				s.removeRange(v)
+				model.difference_update(v)
+			else:
+				start = random_value(rnd, wide)
+				stop = start + rnd.randrange(400)
+				s = s.complement(start, stop)
+				model = set(range(start, stop + 1)) - model
+				in_bits = start >= BITS_MIN and stop < BITS_LIMIT
+			self.assertSameAs(s, model, in_bits)
+
+	def test_bits(self):
+		for seed in range(10):
+			with self.subTest(seed=seed):
+				self.check_random_operations(seed, False)
+
+	def test_ranges(self):
+		for seed in range(10):
+			with self.subTest(seed=seed):
+				self.check_random_operations(seed, True)
+
+	def test_remove_range_splits(self):
+		for start in (10, BITS_LIMIT + 10):
+			s = IntervalSet()
+			s.addRange(range(start, start + 100))
+			s.addOne(0x10000) # the ranges are kept as a list
+			s.removeRange(range(start + 10, start + 20))
+			self.assertEqual(s.intervals, [range(start, start + 10),
+											range(start + 20, start + 100),
+											range(0x10000, 0x10001)])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,54 @@
+import pickle
+import unittest
+from Graphvizer.antlr4.IntervalSet import IntervalSet
+from Graphvizer.antlr4.atn.ATN import ATN
+from Graphvizer.antlr4.atn.ATNDeserializer import ATNDeserializer
+from Graphvizer.antlr4.atn.ATNState import ATNState
+from Graphvizer.lexerparser import DOTLexer, DOTParser, PrebuiltATN
+
+
+# A comparable value of an ATN part. The states are referred to by number,
+# and the follow sets cached by the ATN as it is used are left out.
+def describe(value):
+	if isinstance(value, ATN):
+		return "atn"
+	if isinstance(value, ATNState):
+		return value.stateNumber
+	if isinstance(value, IntervalSet):
+		return list(value.intervals or ())
+	if isinstance(value, (list, tuple)):
+		return [describe(item) for item in value]
+	if isinstance(value, dict):
+		return sorted((key, describe(item)) for key, item in value.items())
+	if value is None or isinstance(value, (bool, int, str, range)):
+		return value
+	return describe_fields(value)
+
+def describe_fields(value):
+	return (type(value).__name__, sorted((name, describe(item)) for name, item in vars(value).items()
+											if name != "nextTokenWithinRule"))
+
+def describe_atn(atn):
+	return [describe_fields(state) for state in atn.states], describe_fields(atn)
+
+
+class PrebuiltATNTest(unittest.TestCase):
+
+	# The pickled ATNs, and the ATNs the recognizers loaded, are built from the
+	# current grammar and format, and they are the ones serializedATN()
+	# deserializes to
+	def test_current(self):
+		for module in (DOTLexer, DOTParser):
+			recognizer = module.__name__.rsplit(".", 1)[-1]
+			with self.subTest(recognizer):
+				serialized = module.serializedATN()
+				with open(file=PrebuiltATN.get_atn_filepath(recognizer), mode="rb") as fd:
+					version, atn = pickle.load(fd)
+				self.assertEqual(version, PrebuiltATN.get_version(serialized))
+				expected = describe_atn(ATNDeserializer().deserialize(serialized))
+				self.assertEqual(describe_atn(atn), expected)
+				self.assertEqual(describe_atn(getattr(module, recognizer).atn), expected)
+
+
+if __name__ == '__main__':
+	unittest.main()
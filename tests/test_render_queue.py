@@ -0,0 +1,114 @@
+import threading
+import unittest
+import sublime
+from Graphvizer.lib.render_queue import RenderQueue
+
+
+def no_visible_keys():
+	return set()
+
+# Take an item in another thread, which blocks until one can be taken
+class Taker(threading.Thread):
+
+	def __init__(self, queue, get_visible_keys=no_visible_keys):
+		super().__init__(daemon=True)
+		self.queue = queue
+		self.get_visible_keys = get_visible_keys
+		self.taken = None
+		self.start()
+
+	def run(self):
+		self.taken = self.queue.get(self.get_visible_keys)
+
+
+class TestRenderQueue(unittest.TestCase):
+
+	def setUp(self):
+		self.queue = RenderQueue()
+		self.views = [sublime.View(view_id) for view_id in range(5)]
+
+	def put(self, *view_ids):
+		for view_id in view_ids:
+			self.queue.put(view_id, self.views[view_id])
+
+	def take(self, get_visible_keys=no_visible_keys):
+		key, view = self.queue.get(get_visible_keys)
+		self.assertEqual(view.id(), key)
+		return key
+
+	def test_put_replaces_in_place(self):
+		self.assertTrue(self.queue.put(1, "old"))
+		self.assertTrue(self.queue.put(2, "other"))
+		self.assertFalse(self.queue.put(1, "new"))
+		self.assertEqual(len(self.queue), 2)
+		# The replaced item keeps its place
+		self.assertEqual(self.queue.get(no_visible_keys), (1, "new"))
+		self.assertEqual(self.queue.get(no_visible_keys), (2, "other"))
+
+	def test_cancel(self):
+		self.put(1, 2)
+		self.assertIs(self.queue.cancel(1), self.views[1])
+		self.assertIsNone(self.queue.cancel(1))
+		self.assertFalse(self.queue.is_queued(1))
+		self.assertTrue(self.queue.is_queued(2))
+		self.assertEqual(len(self.queue), 1)
+
+	def test_drain(self):
+		self.put(3, 1, 2)
+		self.assertEqual(self.queue.drain(), [self.views[3], self.views[1], self.views[2]])
+		self.assertEqual(len(self.queue), 0)
+		self.assertEqual(self.queue.drain(), [])
+
+	def test_get_skips_running_keys(self):
+		self.put(1)
+		self.assertEqual(self.take(), 1)
+		# The newer revision of 1 waits until its rendering is done
+		self.put(1, 2)
+		self.assertEqual(self.take(), 2)
+		taker = Taker(self.queue)
+		taker.join(0.2)
+		self.assertIsNone(taker.taken)
+		self.queue.done(2) # doesn't release 1
+		taker.join(0.2)
+		self.assertIsNone(taker.taken)
+		self.queue.done(1)
+		taker.join(5)
+		self.assertEqual(taker.taken, (1, self.views[1]))
+
+	def test_get_waits_for_put(self):
+		taker = Taker(self.queue)
+		taker.join(0.2)
+		self.assertIsNone(taker.taken)
+		self.put(4)
+		taker.join(5)
+		self.assertEqual(taker.taken, (4, self.views[4]))
+
+	def test_active_then_visible_then_oldest(self):
+		self.put(1, 2, 3, 4)
+		self.queue.set_active(3)
+		visible = lambda: {4, 2}
+		self.assertEqual(self.take(visible), 3)
+		# The visible ones in the order they were queued
+		self.assertEqual(self.take(visible), 2)
+		self.assertEqual(self.take(visible), 4)
+		self.assertEqual(self.take(visible), 1)
+
+	def test_running_active_key_is_skipped(self):
+		self.put(1)
+		self.queue.set_active(1)
+		self.assertEqual(self.take(), 1)
+		self.put(1, 2)
+		self.assertEqual(self.take(), 2)
+
+	def test_starving_item_goes_first(self):
+		self.put(1, 2)
+		self.queue.set_active(2)
+		self.assertEqual(self.take(lambda: {2}), 2)
+		self.put(2)
+		self.queue.done(2)
+		self.queue.STARVATION_TIME = 0 # every item has waited long enough
+		self.assertEqual(self.take(lambda: {2}), 1)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+from Graphvizer.antlr4 import CommonTokenStream, InputStream
+from Graphvizer.lexerparser import syntaxchecker
+from Graphvizer.lexerparser.DOTLexer import DOTLexer
+from Graphvizer.lexerparser.DOTParser import DOTParser
+from .fuzz import load_corpus, mutate, fuzzed_corpus
+
+
+# The check as it was before SLL prediction, the tokenizer and the caches: a
+# single full LL parse with new recognizers
+def check_ll(dot):
+	lexer = DOTLexer(InputStream(dot))
+	parser = DOTParser(CommonTokenStream(lexer))
+	lexer.removeErrorListeners()
+	lexer.addErrorListener(syntaxchecker.DOTErrorListener())
+	parser.removeErrorListeners()
+	parser.addErrorListener(syntaxchecker.DOTErrorListener())
+	try:
+		parser.graph()
+		return True, "Syntax check passed"
+	except Exception as e:
+		return False, str(e)
+
+# Files of the corpus that aren't valid DOT. The grammar ignores what follows
+# the graph, so trailing.gv is valid.
+INVALID = {"bad_attributes.gv", "bad_edges.gv", "keywords.gv", "lexical_errors.gv",
+			"missing_brace.gv"}
+
+
+# check() returns the verdict and the message of a full LL parse
+class TestSyntaxChecker(unittest.TestCase):
+
+	def setUp(self):
+		syntaxchecker.statement_cache = syntaxchecker.StatementCache()
+
+	def assertSameAsLL(self, dot, key=None):
+		self.assertEqual(syntaxchecker.check(dot, key), check_ll(dot), dot)
+
+	def test_corpus(self):
+		for name, dot in load_corpus():
+			with self.subTest(name):
+				self.assertEqual(syntaxchecker.check(dot)[0], name not in INVALID)
+				self.assertSameAsLL(dot)
+
+	def test_fuzzed_corpus(self):
+		for dot in fuzzed_corpus(seed=12, mutation_count=150, random_count=1000):
+			self.assertSameAsLL(dot)
+
+	# Each document is edited several times in a row, so the tokens and the
+	# statements of the previous revisions are reused
+	def test_edited_documents(self):
+		rng = random.Random(34)
+		for key, (name, dot) in enumerate(load_corpus()):
+			with self.subTest(name):
+				for i in range(60):
+					self.assertSameAsLL(dot, key)
+					edited = mutate(dot, rng)
+					# Keep going from the valid revisions, like someone typing
+					if syntaxchecker.check(edited)[0] or rng.random() < 0.3:
+						dot = edited
+				syntaxchecker.forget(key)
+
+	def test_nested_subgraphs(self):
+		for depth in (1, 10, 60):
+			dot = "digraph {" + "subgraph s { a -> b [w=1];" * depth + "}" * depth + "}"
+			self.assertSameAsLL(dot)
+			self.assertSameAsLL(dot[:-depth])
+			self.assertSameAsLL(dot.replace("[w=1]", "[w=]", 1))
+
+	# Both parses exceed the recursion limit. Where it is hit, and so the message
+	# of the RecursionError, depends on the Python version.
+	def test_nesting_past_recursion_limit(self):
+		dot = "digraph {" + "subgraph s { a -> b;" * 400 + "}" * 400 + "}"
+		for key in (None, 1):
+			valid, log = syntaxchecker.check(dot, key)
+			self.assertFalse(valid)
+			self.assertIn("maximum recursion depth exceeded", log)
+		self.assertFalse(check_ll(dot)[0])
+
+
+if __name__ == '__main__':
+	unittest.main()
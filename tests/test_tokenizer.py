@@ -0,0 +1,107 @@
+import random
+import unittest
+from Graphvizer.antlr4 import InputStream, Token
+from Graphvizer.antlr4.error.ErrorListener import ErrorListener
+from Graphvizer.lexerparser.DOTLexer import DOTLexer
+from Graphvizer.lexerparser.DOTTokenizer import DOTTokenizer
+from .fuzz import load_corpus, mutate, fuzzed_corpus, random_texts
+
+
+class RecordingErrorListener(ErrorListener):
+
+	def __init__(self):
+		self.errors = []
+
+	def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+		self.errors.append((line, column, msg))
+
+class RaisingErrorListener(ErrorListener):
+
+	def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+		raise ValueError("line %d, column %d: %s" %(line, column, msg))
+
+def describe(token):
+	return (token.type, token.channel, token.start, token.stop, token.line, token.column,
+			token.text, token.tokenIndex)
+
+# Return the tokens of `dot` and the errors reported on the way
+def lex(lexer_class, dot):
+	lexer = lexer_class(InputStream(dot))
+	listener = RecordingErrorListener()
+	lexer.removeErrorListeners()
+	lexer.addErrorListener(listener)
+	tokens = []
+	while True:
+		token = lexer.nextToken()
+		tokens.append(describe(token))
+		if token.type == Token.EOF:
+			return tokens, listener.errors
+
+def new_tokenizer():
+	tokenizer = DOTTokenizer(None)
+	tokenizer.removeErrorListeners()
+	tokenizer.addErrorListener(RaisingErrorListener())
+	return tokenizer
+
+# Return the tokens of tokenize(), or the error raised
+def tokenize(dot, old_dot=None, old_tokens=None):
+	try:
+		tokens = new_tokenizer().tokenize(dot, old_dot, old_tokens)
+	except ValueError as e:
+		return str(e)
+	return [describe(token)[:-1] for token in tokens] # the indexes are set by the token stream
+
+
+class TestDOTTokenizer(unittest.TestCase):
+
+	# Same tokens and errors as DOTLexer
+	def test_same_tokens_as_dotlexer(self):
+		rng = random.Random(56)
+		texts = fuzzed_corpus(seed=78, mutation_count=100, random_count=1000)
+		# Characters that start or end tokens, alone or in random strings
+		texts.extend("".join(rng.choice('<>"\\/*-.#\n\r\t {}[];=,:09aZ_é节@') for i in range(rng.randrange(1, 15)))
+					for j in range(5000))
+		for dot in texts:
+			self.assertEqual(lex(DOTTokenizer, dot), lex(DOTLexer, dot), dot)
+
+	# Lexing only the edited part gives the tokens of a lex from scratch
+	def test_incremental_tokenize(self):
+		rng = random.Random(90)
+		documents = [dot for name, dot in load_corpus()] + random_texts(rng, 500)
+		for i in range(10000):
+			old_dot = rng.choice(documents)
+			try:
+				old_tokens = new_tokenizer().tokenize(old_dot)
+			except ValueError: # only the tokens of a whole input are kept
+				continue
+			dot = mutate(old_dot, rng)
+			self.assertEqual(tokenize(dot, old_dot, old_tokens), tokenize(dot), (old_dot, dot))
+			documents.append(dot)
+
+
+class TestDOTLexer(unittest.TestCase):
+
+	# The DFA edges of characters above MAX_DFA_EDGE are kept in sparseEdges, so
+	# a second lex of CJK text doesn't compute their target states
+	def test_sparse_edges(self):
+		dot = 'digraph 图 {\n\t节点 -> 名字 [label="有向图", 颜色=红];\n\t// 注释\n}\n'
+		self.assertEqual(lex(DOTLexer, dot)[1], [])
+		lexer = DOTLexer(InputStream(dot))
+		computed = []
+		compute = lexer._interp.computeTargetState
+		def computeTargetState(input, s, t):
+			if t > lexer._interp.MAX_DFA_EDGE:
+				computed.append(chr(t))
+			return compute(input, s, t)
+		lexer._interp.computeTargetState = computeTargetState
+		while lexer.nextToken().type != Token.EOF:
+			pass
+		self.assertEqual(computed, [])
+		sparse = set()
+		for state in lexer._interp.decisionToDFA[0].states:
+			sparse.update(state.sparseEdges or ())
+		self.assertLessEqual(set(map(ord, "图节点名字有向颜色红注释")), sparse)
+
+
+if __name__ == '__main__':
+	unittest.main()